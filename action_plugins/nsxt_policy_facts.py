@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Action plugin shared by nsx-t policy facts modules (nsxt_policy_segments_facts, ...).
+#
+# With 'cacheable: true' modules return their objects in 'ansible_facts', which
+# are kept by the fact cache plugin. The action plugin tags these facts with a key
+# of the task module and args, and when 'max_age' is set, returns facts of the
+# same key younger than max_age seconds without running the module.
+# Modules are run by nsxt_policy_local action plugin (in process on controller).
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import hashlib
+import json
+import time
+
+from ansible.module_utils.common._collections_compat import Mapping
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.plugins.loader import action_loader
+
+LocalActionModule = action_loader.get("nsxt_policy_local", class_only=True)
+
+# Options which don't change returned facts
+NSX_CACHE_IGNORED_PARAMS = ["password", "max_age"]
+
+
+# Return key of facts returned by module with args
+def get_nsx_facts_cache_key(module_name, module_args):
+    cache_args = dict(
+        (key, value)
+        for key, value in module_args.items()
+        if key not in NSX_CACHE_IGNORED_PARAMS
+    )
+    return hashlib.sha256(
+        json.dumps([module_name, cache_args], sort_keys=True, default=str).encode(
+            "utf-8"
+        )
+    ).hexdigest()
+
+
+class ActionModule(LocalActionModule):
+    def run(self, tmp=None, task_vars=None):
+        self._supports_check_mode = True
+        self._supports_async = True
+
+        if task_vars is None:
+            task_vars = dict()
+        if not boolean(self._task.args.get("cacheable", False), strict=False):
+            return super(ActionModule, self).run(tmp, task_vars)
+
+        cache_key = get_nsx_facts_cache_key(self._task.action, self._task.args)
+        cached_facts = self.get_cached_facts(task_vars, cache_key)
+        if cached_facts is not None:
+            result = ActionBase.run(self, tmp, task_vars)
+            del tmp
+            result.update(changed=False, cached=True, ansible_facts=cached_facts)
+            return result
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+        for fact in (result.get("ansible_facts") or {}).values():
+            fact["cache_key"] = cache_key
+        return result
+
+    # Return facts of cache key younger than max_age, None if there are none
+    def get_cached_facts(self, task_vars, cache_key):
+        max_age = int(self._task.args.get("max_age") or 0)
+        if max_age <= 0:
+            return None
+        for fact_name, fact in (task_vars.get("ansible_facts") or {}).items():
+            if (
+                isinstance(fact, Mapping)
+                and fact.get("cache_key") == cache_key
+                and time.time() - float(fact.get("timestamp") or 0) < max_age
+            ):
+                return {fact_name: fact}
+        return None
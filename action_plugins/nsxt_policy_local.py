@@ -0,0 +1,217 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Action plugin shared by all nsx-t policy modules.
+#
+# These modules only call the NSX manager api, so when the task runs on the
+# controller (connection local, as with 'delegate_to: localhost') the module
+# main() is called inside the ansible worker process instead of packaging the
+# module, starting a python interpreter and importing requests for each call.
+# Loaded modules and api sessions (with their connection pool) are kept for all
+# module calls of the worker, e.g. all items of a loop.
+# Set 'nsxt_policy_in_process: false' to always run modules as usual. Ansible versions
+# without the ansible internals used for this also run them as usual.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+import importlib.util
+import io
+import json
+import os
+import sys
+import traceback
+from contextlib import redirect_stdout
+
+from ansible.module_utils.parsing.convert_bool import boolean
+from ansible.plugins.action import ActionBase
+from ansible.plugins.loader import module_utils_loader
+from ansible.utils.display import Display
+from ansible.utils.unsafe_proxy import wrap_var
+from ansible.utils.vars import merge_hash
+from ansible.vars.clean import remove_internal_keys
+
+display = Display()
+
+NSX_MODULE_UTILS = "vmware_nsxt_policy_apis"
+
+# Modules loaded in this process by module file path
+LOADED_MODULES = {}
+
+
+# Import role module_utils under the name modules import it from
+def load_nsx_module_utils():
+    name = "ansible.module_utils." + NSX_MODULE_UTILS
+    if name not in sys.modules:
+        path = module_utils_loader.find_plugin(NSX_MODULE_UTILS, mod_type=".py")
+        if not path:
+            path = os.path.join(
+                os.path.dirname(os.path.abspath(__file__)),
+                "..",
+                "module_utils",
+                NSX_MODULE_UTILS + ".py",
+            )
+        spec = importlib.util.spec_from_file_location(name, path)
+        module_utils = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module_utils)
+        sys.modules[name] = module_utils
+    return sys.modules[name]
+
+
+def load_nsx_module(module_path):
+    if module_path not in LOADED_MODULES:
+        load_nsx_module_utils()
+        name = "ansible_nsxt_policy_local_" + os.path.splitext(
+            os.path.basename(module_path)
+        )[0]
+        spec = importlib.util.spec_from_file_location(name, module_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        LOADED_MODULES[module_path] = module
+    return LOADED_MODULES[module_path]
+
+
+# Return ansible internals used to call module main() in process (module args,
+# global warnings and json encoder), none when this ansible version doesn't have
+# them as expected (ansible 2.9, module args profiles of ansible-core 2.19)
+def get_nsx_module_internals():
+    try:
+        from ansible.module_utils import basic
+        from ansible.module_utils.common import warnings
+        from ansible.module_utils.common.json import AnsibleJSONEncoder
+    except ImportError:
+        return None
+    if (
+        not hasattr(basic, "_ANSIBLE_ARGS")
+        or hasattr(basic, "_ANSIBLE_PROFILE")
+        or not isinstance(getattr(warnings, "_global_warnings", None), list)
+        or not isinstance(getattr(warnings, "_global_deprecations", None), list)
+    ):
+        return None
+    return basic, warnings, AnsibleJSONEncoder
+
+
+# Call module main() with module args and return its json output
+def run_nsx_module(module, module_args, internals):
+    basic, warnings, AnsibleJSONEncoder = internals
+    basic._ANSIBLE_ARGS = json.dumps(
+        dict(ANSIBLE_MODULE_ARGS=module_args), cls=AnsibleJSONEncoder
+    ).encode("utf-8")
+    del warnings._global_warnings[:]
+    del warnings._global_deprecations[:]
+    stdout = io.StringIO()
+    try:
+        with redirect_stdout(stdout):
+            module.main()
+    except SystemExit:
+        pass
+    except Exception as err:
+        return json.dumps(
+            dict(
+                failed=True,
+                msg="MODULE FAILURE: %s" % (err),
+                exception=traceback.format_exc(),
+            )
+        )
+    finally:
+        basic._ANSIBLE_ARGS = None
+        del warnings._global_warnings[:]
+        del warnings._global_deprecations[:]
+    return stdout.getvalue()
+
+
+class ActionModule(ActionBase):
+    def run(self, tmp=None, task_vars=None):
+        self._supports_check_mode = True
+        self._supports_async = True
+
+        result = super(ActionModule, self).run(tmp, task_vars)
+        del tmp
+
+        wrap_async = self._task.async_val and not self._connection.has_native_async
+        result = merge_hash(
+            result, self._execute_module(task_vars=task_vars, wrap_async=wrap_async)
+        )
+        if not wrap_async:
+            self._remove_tmp_path(self._connection._shell.tmpdir)
+        return result
+
+    # Modules run in process only for tasks which would run them on the controller as is
+    def is_in_process(self, task_vars, wrap_async):
+        try:
+            import requests  # noqa: F401
+        except ImportError:
+            return False
+        return (
+            get_nsx_module_internals() is not None
+            and boolean(task_vars.get("nsxt_policy_in_process", True), strict=False)
+            and self._connection.transport == "local"
+            and not wrap_async
+            and not self._task.async_val
+            and not self._play_context.become
+            and not any(self._task.environment or [])
+        )
+
+    def _execute_module(
+        self,
+        module_name=None,
+        module_args=None,
+        tmp=None,
+        task_vars=None,
+        persist_files=False,
+        delete_remote_tmp=None,
+        wrap_async=False,
+    ):
+        if task_vars is None:
+            task_vars = dict()
+        if not self.is_in_process(task_vars, wrap_async):
+            return super(ActionModule, self)._execute_module(
+                module_name=module_name,
+                module_args=module_args,
+                task_vars=task_vars,
+                wrap_async=wrap_async,
+            )
+
+        if module_name is None:
+            module_name = self._task.action
+        if module_args is None:
+            module_args = self._task.args
+        module_args = dict(module_args)
+        self._update_module_args(module_name, module_args, task_vars)
+
+        module_path = self._shared_loader_obj.module_loader.find_plugin(
+            module_name, mod_type=".py"
+        )
+        display.vvv("Running module file %s in process" % module_path)
+        try:
+            module = load_nsx_module(module_path)
+        except Exception as err:
+            display.warning(
+                "Unable to load %s in process, running it as usual: %s"
+                % (module_name, err)
+            )
+            return super(ActionModule, self)._execute_module(
+                module_name=module_name,
+                module_args=module_args,
+                task_vars=task_vars,
+            )
+
+        data = self._parse_returned_data(
+            dict(
+                rc=0,
+                stdout=run_nsx_module(module, module_args, get_nsx_module_internals()),
+                stderr="",
+            )
+        )
+        remove_internal_keys(data)
+        return wrap_var(data)
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+# Action plugin shared by nsx-t policy write modules (nsxt_policy_segments, ...).
+#
+# When a task loops over a write module with 'loop', the first item renders all
+# loop items, runs the module once per group of items with the 'items' option
+# (one listing and one hierarchical api call) and keeps per-item results.
+# Next items of the loop return their result without running the module.
+# Any task it can't fold (with_* loops, until, async...) runs the module as usual,
+# as do loops on ansible versions without the ansible internals used to fold them.
+# Modules are run by nsxt_policy_local action plugin (in process on controller).
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils._text import to_native
+from ansible.plugins.action import ActionBase
+from ansible.plugins.loader import action_loader
+from ansible.utils.vars import merge_hash
+
+LocalActionModule = action_loader.get("nsxt_policy_local", class_only=True)
+
+# Options which must be the same for all items of one module call
+NSX_GROUP_PARAMS = [
+    "hostname",
+    "username",
+    "password",
+    "port",
+    "validate_certs",
+    "wait",
+    "batch_size",
+    "parallel_batches",
+    "state_hash",
+    "full_compare",
+    "log_level",
+    "domain",
+    "tier0",
+    "tier1",
+    "locale_service",
+    "segment",
+    "ippool",
+]
+
+# Per-item results of folded loops by (task uuid, host), in loop order
+FOLDED_RESULTS = {}
+
+
+class ActionModule(LocalActionModule):
+    def run(self, tmp=None, task_vars=None):
+        self._supports_check_mode = True
+        self._supports_async = True
+
+        item_result = self.get_folded_result(task_vars)
+        if item_result is None:
+            return super(ActionModule, self).run(tmp, task_vars)
+
+        result = ActionBase.run(self, tmp, task_vars)
+        del tmp
+        return merge_hash(result, item_result)
+
+    # Return result of loop item from folded module call, None to run module
+    def get_folded_result(self, task_vars):
+        key = (self._task._uuid, task_vars.get("inventory_hostname"))
+        folded_results = FOLDED_RESULTS.get(key)
+        if folded_results:
+            item_args, item_result = folded_results.pop(0)
+            if not folded_results:
+                FOLDED_RESULTS.pop(key)
+            if item_args == self._task.args:
+                return item_result
+            # Loop doesn't run as expected, run module for each remaining item
+            FOLDED_RESULTS.pop(key, None)
+
+        elif self.is_foldable_loop(task_vars):
+            try:
+                folded_results = self.get_folded_loop_args(task_vars)
+            except Exception:
+                folded_results = None
+            if folded_results and folded_results[0] == self._task.args:
+                FOLDED_RESULTS[key] = self.run_folded_loop(folded_results, task_vars)
+                item_args, item_result = FOLDED_RESULTS[key].pop(0)
+                if not FOLDED_RESULTS[key]:
+                    FOLDED_RESULTS.pop(key)
+                return item_result
+        return None
+
+    # Only fold tasks using 'loop' keyword, with results that don't depend on previous items
+    def is_foldable_loop(self, task_vars):
+        loop_control = self._task.loop_control
+        return (
+            "ansible_loop_var" in task_vars
+            and self._task.loop is not None
+            and not self._task.loop_with
+            and not self._task.until
+            and not self._task.async_val
+            and not (loop_control and loop_control.extended)
+            and not self._task.args.get("items")
+        )
+
+    # Render module args of all loop items which will run (when condition is true),
+    # raise an exception (loop not folded) on ansible versions without the task and
+    # templar internals used (ansible 2.9, ansible-core 2.19)
+    def get_folded_loop_args(self, task_vars):
+        from ansible.executor.task_executor import remove_omit
+
+        loop_var = task_vars["ansible_loop_var"]
+        index_var = task_vars.get("ansible_index_var")
+        omit_token = task_vars.get("omit")
+        loop_items = self._templar.template(self._task.loop)
+
+        # Options set by module_defaults aren't in task args
+        default_args = dict(
+            (key, value)
+            for key, value in self._task.args.items()
+            if key not in self._task.untemplated_args
+        )
+
+        loop_args = []
+        for index, item in enumerate(loop_items):
+            item_vars = dict(task_vars)
+            item_vars[loop_var] = item
+            if index_var:
+                item_vars[index_var] = index
+            with self._templar.set_temporary_context(available_variables=item_vars):
+                if not self._task.evaluate_conditional(self._templar, item_vars):
+                    continue
+                item_args = self._templar.template(self._task.untemplated_args)
+            item_args = dict(default_args, **item_args)
+            if omit_token is not None:
+                item_args = remove_omit(item_args, omit_token)
+            loop_args.append(item_args)
+        return loop_args
+
+    # Run module once per group of items and return (args, result) of each item
+    def run_folded_loop(self, loop_args, task_vars):
+        groups = {}
+        for index, item_args in enumerate(loop_args):
+            group_key = tuple(
+                to_native(item_args.get(param)) for param in NSX_GROUP_PARAMS
+            )
+            groups.setdefault(group_key, []).append(index)
+
+        loop_results = [None] * len(loop_args)
+        for indexes in groups.values():
+            group_args = [loop_args[index] for index in indexes]
+            module_args = dict(
+                (key, value)
+                for key, value in group_args[0].items()
+                if all(key in args and args[key] == value for args in group_args)
+            )
+            module_args["items"] = [
+                dict(
+                    (key, value)
+                    for key, value in args.items()
+                    if key not in module_args
+                )
+                for args in group_args
+            ]
+            module_result = self._execute_module(
+                module_args=module_args, task_vars=task_vars
+            )
+            item_results = module_result.get("results") or []
+            for position, index in enumerate(indexes):
+                if len(item_results) != len(indexes):
+                    # Whole module call failed, report its error on each item
+                    item_result = dict(module_result, failed=True)
+                    item_result.pop("results", None)
+                    item_result.setdefault("msg", "Failed to run items")
+                else:
+                    item_result = dict(item_results[position])
+                    if "debug" in module_result:
+                        item_result["debug"] = module_result["debug"]
+                loop_results[index] = (loop_args[index], item_result)
+
+        self._remove_tmp_path(self._connection._shell.tmpdir)
+        return loop_results
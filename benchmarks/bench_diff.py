@@ -0,0 +1,361 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Micro-benchmark of the diff engine of module_utils/vmware_nsxt_policy_apis.py.
+
+Generates large synthetic nsx-t objects (security policy with 5k rules, LB pool
+with 2k members, group with 10k IP expressions, 30 tags) and times
+check_for_update and compare_nsx_object on equal, unchanged, reordered and
+changed objects. Prints ops/sec and peak memory of each case, and the speed ratio
+of each function to the legacy recurse_compare_dict (frozen copy below) for
+objects equal to params, the only case it fully compares.
+
+usage: python benchmarks/bench_diff.py [--scenario NAME] [--repeat N]
+
+Requires the python packages needed by the module utils (ansible, requests).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import copy
+import importlib.util
+import os
+import random
+import time
+import tracemalloc
+
+MODULE_UTILS = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "..",
+    "module_utils",
+    "vmware_nsxt_policy_apis.py",
+)
+
+
+def load_module_utils():
+    spec = importlib.util.spec_from_file_location(
+        "vmware_nsxt_policy_apis", MODULE_UTILS
+    )
+    module_utils = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module_utils)
+    return module_utils
+
+
+# Api params removed from objects before recurse_compare_dict by legacy
+# check_for_update
+LEGACY_API_PARAMS = [
+    "_links",
+    "_schema",
+    "_self",
+    "display_name",
+    "type",
+    "marked_for_delete",
+    "id",
+    "path",
+    "parent_path",
+    "relative_path",
+    "_create_user",
+    "_create_time",
+    "_last_modified_user",
+    "_last_modified_time",
+    "_system_owned",
+    "_protection",
+    "_revision",
+]
+
+
+def legacy_remove_api_params(nsx_object):
+    for key in LEGACY_API_PARAMS:
+        nsx_object.pop(key, None)
+    for key, value in nsx_object.copy().items():
+        if value is None:
+            nsx_object.pop(key, None)
+    return nsx_object
+
+
+# Frozen copy of the legacy comparator replaced by compare_nsx_object, used as
+# reference (its debug prints are removed)
+def legacy_recurse_compare_dict(d1, d2, is_different=False):
+    d1_keys = set(d1.keys())
+    d2_keys = set(d2.keys())
+    if bool(d1_keys ^ d2_keys):
+        is_different = True
+    else:
+        for k, v in sorted(d1.items()):
+            if isinstance(v, dict):
+                is_different = legacy_recurse_compare_dict(v, d2[k], is_different)
+            elif isinstance(v, list):
+                if len(v) != len(d2[k]):
+                    is_different = True
+                else:
+                    index = 0
+
+                    if len(v) > 0 and isinstance(v[0], dict):
+                        v_keys = set(v[0].keys())
+                        ordered_v = sorted(
+                            v,
+                            key=lambda d: next(
+                                (i for (i, y) in enumerate(v_keys) if y in d),
+                                len(v_keys) + 1,
+                            ),
+                        )
+                        ordered_d2 = sorted(
+                            d2[k],
+                            key=lambda d: next(
+                                (i for (i, y) in enumerate(v_keys) if y in d),
+                                len(v_keys) + 1,
+                            ),
+                        )
+                        for e in ordered_v:
+                            if isinstance(e, dict):
+                                is_different = legacy_recurse_compare_dict(
+                                    e, ordered_d2[index], is_different
+                                )
+                            else:
+                                if str(e) != str(ordered_d2[index]):
+                                    is_different = True
+                            index += 1
+            else:
+                if str(v) != str(d2[k]):
+                    is_different = True
+    return is_different
+
+
+# Minimal module object used by check_for_update
+class BenchModule:
+    params = dict(full_compare=False)
+
+    def fail_json(self, **kwargs):
+        raise RuntimeError(kwargs["msg"])
+
+
+# Add attributes set by nsx-t on objects returned by api
+def add_server_attributes(nsx_object, object_id, index=0):
+    nsx_object.update(
+        id=object_id,
+        path="/infra/%s" % object_id,
+        relative_path=object_id,
+        parent_path="/infra",
+        unique_id="%08x-0000-4000-8000-%012x" % (index, index),
+        marked_for_delete=False,
+        overridden=False,
+        _create_user="admin",
+        _create_time=1600000000000 + index,
+        _last_modified_user="admin",
+        _last_modified_time=1600000000000 + index,
+        _system_owned=False,
+        _protection="NOT_PROTECTED",
+        _revision=3,
+    )
+    return nsx_object
+
+
+def get_tags(count=30):
+    return [dict(scope="scope-%s" % i, tag="tag-%s" % i) for i in range(count)]
+
+
+def get_security_policy(rules=5000):
+    params = dict(
+        category="Application",
+        sequence_number=10,
+        stateful=True,
+        tags=get_tags(),
+        rules=[
+            dict(
+                display_name="rule-%s" % i,
+                sequence_number=i,
+                source_groups=["/infra/domains/default/groups/src-%s" % i],
+                destination_groups=["/infra/domains/default/groups/dst-%s" % i],
+                services=["/infra/services/HTTPS", "/infra/services/SSH"],
+                scope=["ANY"],
+                action="ALLOW" if i % 2 else "DROP",
+                logged=False,
+                disabled=False,
+                direction="IN_OUT",
+                ip_protocol="IPV4_IPV6",
+            )
+            for i in range(rules)
+        ],
+    )
+    nsx_object = add_server_attributes(copy.deepcopy(params), "policy")
+    for index, rule in enumerate(nsx_object["rules"]):
+        add_server_attributes(rule, "rule-%s" % index, index)
+        rule["rule_id"] = 1000 + index
+    return params, nsx_object, "security-policies", "rules"
+
+
+def get_lb_pool(members=2000):
+    params = dict(
+        algorithm="ROUND_ROBIN",
+        min_active_members=1,
+        tcp_multiplexing_enabled=False,
+        tcp_multiplexing_number=6,
+        active_monitor_paths=["/infra/lb-monitor-profiles/default-http-lb-monitor"],
+        tags=get_tags(),
+        members=[
+            dict(
+                display_name="member-%s" % i,
+                ip_address="10.%s.%s.%s" % (i // 65536, (i // 256) % 256, i % 256),
+                port="443",
+            )
+            for i in range(members)
+        ],
+    )
+    nsx_object = add_server_attributes(copy.deepcopy(params), "pool")
+    return params, nsx_object, "lb-pools", "members"
+
+
+def get_group(expressions=10000):
+    expression = []
+    for i in range(expressions // 2):
+        if expression:
+            expression.append(
+                dict(resource_type="ConjunctionOperator", conjunction_operator="OR")
+            )
+        expression.append(
+            dict(
+                resource_type="IPAddressExpression",
+                ip_addresses=["10.%s.%s.0/24" % (i // 256, i % 256)],
+            )
+        )
+    params = dict(expression=expression, tags=get_tags())
+    nsx_object = add_server_attributes(copy.deepcopy(params), "group")
+    for index, member in enumerate(nsx_object["expression"]):
+        add_server_attributes(member, "expression-%s" % index, index)
+    return params, nsx_object, "groups", "expression"
+
+
+def get_tagged_segment():
+    params = dict(
+        transport_zone_path="/infra/sites/default/enforcement-points/default"
+        "/transport-zones/tz",
+        tags=get_tags(),
+    )
+    nsx_object = add_server_attributes(copy.deepcopy(params), "segment")
+    return params, nsx_object, "segments", "tags"
+
+
+SCENARIOS = dict(
+    security_policy_5k_rules=get_security_policy,
+    lb_pool_2k_members=get_lb_pool,
+    group_10k_expressions=get_group,
+    segment_30_tags=get_tagged_segment,
+)
+
+
+# Return nsx-t object variants compared with params: equal to params, unchanged,
+# list reordered and one list element changed
+def get_cases(params, nsx_object, list_name):
+    reordered = copy.deepcopy(nsx_object)
+    random.Random(0).shuffle(reordered[list_name])
+    changed = copy.deepcopy(nsx_object)
+    element = changed[list_name][len(changed[list_name]) // 2]
+    element["changed_by_benchmark"] = True
+    for key in ("action", "port", "tag", "conjunction_operator"):
+        if key in element:
+            element[key] = "%s-changed" % element[key]
+    return [
+        ("equal", copy.deepcopy(params)),
+        ("unchanged", nsx_object),
+        ("reordered", reordered),
+        ("changed", changed),
+    ]
+
+
+# Time function called with arguments returned by prepare, which is not timed
+def run_case(prepare, function, repeat):
+    # Warm up and measure peak memory of one run
+    args = prepare()
+    tracemalloc.start()
+    result = function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    elapsed = 0.0
+    for _ in range(repeat):
+        args = prepare()
+        start = time.perf_counter()
+        function(*args)
+        elapsed += time.perf_counter() - start
+    return result, repeat / elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--scenario", choices=sorted(SCENARIOS), action="append")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    module_utils = load_module_utils()
+    module = BenchModule()
+
+    print(
+        "%-26s %-10s %-20s %10s %12s %9s  %s"
+        % ("scenario", "case", "function", "ops/sec", "peak KiB", "vs legacy", "result")
+    )
+    for name in args.scenario or sorted(SCENARIOS):
+        params, nsx_object, api_endpoint, list_name = SCENARIOS[name]()
+        params = module_utils.set_nsx_default_params(api_endpoint, params)
+        for case, case_object in get_cases(params, nsx_object, list_name):
+            default_object = module_utils.set_nsx_default_params(
+                api_endpoint, copy.deepcopy(case_object)
+            )
+            functions = [
+                (
+                    "recurse_compare_dict",
+                    lambda: (
+                        params,
+                        legacy_remove_api_params(copy.deepcopy(default_object)),
+                    ),
+                    legacy_recurse_compare_dict,
+                ),
+                (
+                    "compare_nsx_object",
+                    lambda: (params, default_object),
+                    lambda params, nsx_object: bool(
+                        module_utils.compare_nsx_object(params, nsx_object)
+                    ),
+                ),
+                (
+                    # check_for_update changes the object, give it a copy
+                    "check_for_update",
+                    lambda: (copy.deepcopy(case_object), params),
+                    lambda nsx_object, params: module_utils.check_for_update(
+                        module=module,
+                        object=nsx_object,
+                        params=params,
+                        params_to_remove=[],
+                        protected_params=[],
+                        api_endpoint=api_endpoint,
+                    ),
+                ),
+            ]
+            legacy = None
+            for function_name, prepare, function in functions:
+                result, ops, peak = run_case(prepare, function, args.repeat)
+                if legacy is None:
+                    legacy = (result, ops)
+                # Legacy comparator stops at the first attribute only set by nsx-t,
+                # speeds are only compared when it walks both objects
+                if case == "equal":
+                    ratio = "%.2fx" % (ops / legacy[1])
+                else:
+                    ratio = "-"
+                print(
+                    "%-26s %-10s %-20s %10.2f %12.0f %9s  %s"
+                    % (name, case, function_name, ops, peak / 1024.0, ratio, result)
+                )
+
+
+if __name__ == "__main__":
+    main()
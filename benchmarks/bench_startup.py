@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+"""Cold-start benchmark of the modules in library/.
+
+Each module is imported in a fresh python interpreter, like AnsiballZ does on
+each task, with module_utils/vmware_nsxt_policy_apis.py loaded as
+ansible.module_utils.vmware_nsxt_policy_apis. Prints the median of the whole
+process time and of the import time of each module, and exits with an error if
+a module import takes longer than the target.
+
+usage: python benchmarks/bench_startup.py [--module NAME] [--repeat N] [--target-ms MS]
+
+Requires ansible in the python interpreter running the benchmark.
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import argparse
+import glob
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Run in a fresh interpreter: import module utils and module, print import time
+IMPORT_MODULE = """
+import importlib.util, sys, time
+start = time.perf_counter()
+import ansible.module_utils
+for name, path in (
+    ("ansible.module_utils.vmware_nsxt_policy_apis", sys.argv[1]),
+    ("nsxt_policy_module", sys.argv[2]),
+):
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+print(time.perf_counter() - start)
+"""
+
+
+def run_module_import(module_path):
+    start = time.perf_counter()
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            "-c",
+            IMPORT_MODULE,
+            os.path.join(ROOT, "module_utils", "vmware_nsxt_policy_apis.py"),
+            module_path,
+        ]
+    )
+    return time.perf_counter() - start, float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument("--module", action="append")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--target-ms",
+        type=float,
+        default=150.0,
+        help="maximum median import time of a module in milliseconds",
+    )
+    args = parser.parse_args()
+
+    module_paths = sorted(glob.glob(os.path.join(ROOT, "library", "nsxt_policy_*.py")))
+    if args.module:
+        module_paths = [
+            path
+            for path in module_paths
+            if os.path.basename(path)[:-3] in args.module
+        ]
+
+    print("%-50s %12s %12s" % ("module", "process ms", "import ms"))
+    slow_modules = []
+    for module_path in module_paths:
+        name = os.path.basename(module_path)[:-3]
+        runs = [run_module_import(module_path) for _ in range(args.repeat)]
+        process_ms = statistics.median(run[0] for run in runs) * 1000
+        import_ms = statistics.median(run[1] for run in runs) * 1000
+        print("%-50s %12.1f %12.1f" % (name, process_ms, import_ms))
+        if import_ms > args.target_ms:
+            slow_modules.append(name)
+
+    if slow_modules:
+        sys.exit(
+            "Import time of %s is over target of %s ms"
+            % (", ".join(slow_modules), args.target_ms)
+        )
+
+
+if __name__ == "__main__":
+    main()
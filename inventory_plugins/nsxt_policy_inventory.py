@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+name: nsxt_policy_inventory
+
+short_description: NSX-T virtual machines inventory source
+
+description: >
+    Returns virtual machines of NSX-T inventory (/policy/api/v1/fabric/virtual-machines) as
+    hosts, grouped by tags (tag_<scope>_<tag>), power state (power_<state>) and segments of
+    their interfaces (segment_<segment id>). Configuration file name must end with
+    nsxt_policy.yml or nsxt_policy.yaml.
+
+    With inventory cache, cached inventory is refreshed with objects synced or modified
+    since last run only (search API) and the lists of virtual machine, interface and
+    segment port ids, instead of being read again.
+
+author: Olivier Gintrand
+
+extends_documentation_fragment:
+    - inventory_cache
+    - constructed
+
+options:
+    plugin:
+        description: Name of the plugin
+        required: true
+        choices:
+            - nsxt_policy_inventory
+    hostname:
+        description: Deployed NSX manager hostname.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_HOSTNAME
+    username:
+        description: The username to authenticate with the NSX manager.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_USERNAME
+    password:
+        description: The password to authenticate with the NSX manager.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_PASSWORD
+    validate_certs:
+        description: Insecure connection to NSX manager.
+        required: false
+        default: true
+        type: boolean
+    enforcement_point:
+        description: Enforcement point of virtual machines interfaces.
+        required: false
+        default: default
+        type: str
+    segment_groups:
+        description: Read interfaces and segment ports of virtual machines for segment groups.
+        required: false
+        default: true
+        type: boolean
+    incremental:
+        description:
+            - "Refresh cached inventory with objects modified since last run."
+            - "When false, cached inventory is used as is until cache timeout."
+        required: false
+        default: true
+        type: boolean
+"""
+
+EXAMPLES = """
+
+# nsxt_policy.yml
+plugin: nsxt_policy_inventory
+hostname: "nsxvip.domain.local"
+username: "admin"
+password: "Vmware1!"
+validate_certs: false
+cache: true
+cache_plugin: jsonfile
+cache_connection: /tmp/nsxt_policy_inventory
+cache_timeout: 86400
+keyed_groups:
+    - key: nsxt_tags | map(attribute='scope') | list
+      prefix: scope
+"""
+
+import copy
+import json
+
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_native
+from ansible.module_utils.six.moves.urllib.parse import quote
+from ansible.module_utils.urls import open_url
+from ansible.plugins.inventory import BaseInventoryPlugin, Cacheable, Constructable
+
+
+class InventoryModule(BaseInventoryPlugin, Constructable, Cacheable):
+    NAME = "nsxt_policy_inventory"
+
+    def verify_file(self, path):
+        return super(InventoryModule, self).verify_file(path) and path.endswith(
+            ("nsxt_policy.yml", "nsxt_policy.yaml")
+        )
+
+    def parse(self, inventory, loader, path, cache=True):
+        super(InventoryModule, self).parse(inventory, loader, path, cache)
+        self._read_config_data(path)
+        self.base_url = "https://%s/policy/api/v1" % (self.get_option("hostname"))
+
+        cache_key = self.get_cache_key(path)
+        data = None
+        if self.get_option("cache") and cache:
+            try:
+                data = self._cache[cache_key]
+            except KeyError:
+                pass
+        if data is None:
+            data = self.get_inventory_data()
+        elif self.get_option("incremental"):
+            # Update a copy, cache is only written when data differs from data read
+            data = copy.deepcopy(data)
+            self.update_inventory_data(data)
+        if self.get_option("cache"):
+            self._cache[cache_key] = data
+
+        self.populate(data)
+
+    # Return json of api url
+    def get_json(self, url):
+        try:
+            resp = open_url(
+                url,
+                headers=dict(Accept="application/json"),
+                url_username=self.get_option("username"),
+                url_password=self.get_option("password"),
+                force_basic_auth=True,
+                validate_certs=self.get_option("validate_certs"),
+            )
+            return json.loads(resp.read())
+        except Exception as err:
+            raise AnsibleError("Error getting %s. Error [%s]" % (url, to_native(err)))
+
+    # Return objects of all pages of list (or search) url
+    def get_objects(self, url):
+        nsx_objects = []
+        cursor = None
+        while True:
+            page_url = url
+            if cursor:
+                page_url = "%s%scursor=%s" % (
+                    url,
+                    "&" if "?" in url else "?",
+                    quote(cursor),
+                )
+            resp = self.get_json(page_url)
+            nsx_objects.extend(resp.get("results") or [])
+            cursor = resp.get("cursor")
+            if not cursor or not resp.get("results"):
+                return nsx_objects
+
+    def search_objects(self, query, included_fields=None):
+        url = "%s/search/query?query=%s" % (self.base_url, quote(query))
+        if included_fields:
+            url += "&included_fields=%s" % (included_fields)
+        return self.get_objects(url)
+
+    def get_vifs_url(self):
+        return "%s/infra/realized-state/enforcement-points/%s/vifs" % (
+            self.base_url,
+            quote(self.get_option("enforcement_point")),
+        )
+
+    # Read inventory data: virtual machines by external id, interfaces by attachment
+    # id and segment ports by path, with last sync time of virtual machines and
+    # interfaces (discovered resources) and last modification time of segment ports
+    # read (watermarks)
+    def get_inventory_data(self):
+        data = dict(watermark=0, sync_watermark=0, vms={}, vifs={}, ports={})
+        nsx_objects = self.get_objects(self.base_url + "/fabric/virtual-machines")
+        if self.get_option("segment_groups"):
+            nsx_objects.extend(self.get_objects(self.get_vifs_url()))
+            nsx_objects.extend(self.search_objects("resource_type:SegmentPort"))
+        self.merge_inventory_objects(data, nsx_objects)
+        return data
+
+    # Update inventory data with objects synced or modified since its watermarks, then
+    # with ids listings remove objects which no longer exist and read objects missed
+    def update_inventory_data(self, data):
+        data.setdefault("sync_watermark", 0)
+        resource_types = ["VirtualMachine"]
+        if self.get_option("segment_groups"):
+            resource_types.append("VirtualNetworkInterface")
+        nsx_objects = self.search_objects(
+            "resource_type:(%s) AND _last_sync_time:[%d TO *]"
+            % (" OR ".join(resource_types), data["sync_watermark"])
+        )
+        if self.get_option("segment_groups"):
+            nsx_objects.extend(
+                self.search_objects(
+                    "resource_type:SegmentPort AND _last_modified_time:[%d TO *]"
+                    % (data["watermark"])
+                )
+            )
+        self.merge_inventory_objects(data, nsx_objects)
+
+        self.sync_inventory_objects(
+            data,
+            "vms",
+            set(
+                vm.get("external_id")
+                for vm in self.get_objects(
+                    self.base_url
+                    + "/fabric/virtual-machines?included_fields=external_id"
+                )
+            ),
+            lambda vm_id: self.get_objects(
+                self.base_url + "/fabric/virtual-machines?external_id=" + quote(vm_id)
+            ),
+        )
+        if not self.get_option("segment_groups"):
+            return
+        self.sync_inventory_objects(
+            data,
+            "vifs",
+            set(
+                vif.get("lport_attachment_id")
+                for vif in self.get_objects(
+                    self.get_vifs_url() + "?included_fields=lport_attachment_id"
+                )
+            ),
+            lambda vif_id: self.get_objects(
+                self.get_vifs_url() + "?lport_attachment_id=" + quote(vif_id)
+            ),
+        )
+        self.sync_inventory_objects(
+            data,
+            "ports",
+            set(
+                port.get("path")
+                for port in self.search_objects(
+                    "resource_type:SegmentPort", "path,marked_for_delete"
+                )
+                if not port.get("marked_for_delete")
+            ),
+            lambda port_path: [self.get_json(self.base_url + quote(port_path))],
+        )
+
+    # Remove objects of inventory data key whose id is not in ids listed, and read
+    # objects of ids listed missing from inventory data with get_objects function
+    def sync_inventory_objects(self, data, key, ids, get_objects):
+        for object_id in [object_id for object_id in data[key] if object_id not in ids]:
+            del data[key][object_id]
+        for object_id in sorted(ids - set(data[key]) - set([None])):
+            self.merge_inventory_objects(data, get_objects(object_id))
+
+    def merge_inventory_objects(self, data, nsx_objects):
+        for nsx_object in nsx_objects:
+            resource_type = nsx_object.get("resource_type")
+            if resource_type in ["VirtualMachine", "VirtualNetworkInterface"]:
+                data["sync_watermark"] = max(
+                    data["sync_watermark"], nsx_object.get("_last_sync_time", 0)
+                )
+            else:
+                data["watermark"] = max(
+                    data["watermark"], nsx_object.get("_last_modified_time", 0)
+                )
+            if resource_type == "VirtualMachine":
+                data["vms"][nsx_object["external_id"]] = nsx_object
+            elif resource_type == "VirtualNetworkInterface":
+                data["vifs"][nsx_object.get("lport_attachment_id")] = nsx_object
+            elif resource_type == "SegmentPort":
+                if nsx_object.get("marked_for_delete"):
+                    data["ports"].pop(nsx_object["path"], None)
+                else:
+                    data["ports"][nsx_object["path"]] = nsx_object
+
+    def populate(self, data):
+        segment_paths = dict(
+            ((port.get("attachment") or {}).get("id"), port.get("parent_path"))
+            for port in data["ports"].values()
+        )
+        vm_vifs = {}
+        for vif_id, vif in data["vifs"].items():
+            vm_vifs.setdefault(vif.get("owner_vm_id"), []).append(vif)
+
+        names = set()
+        for vm_id, vm in sorted(data["vms"].items()):
+            name = vm.get("display_name") or vm_id
+            if name in names:
+                name = "%s_%s" % (name, vm_id)
+            names.add(name)
+            self.inventory.add_host(name)
+
+            vifs = vm_vifs.get(vm_id, [])
+            ip_addresses = [
+                ip_address
+                for vif in vifs
+                for ip_address_info in vif.get("ip_address_info") or []
+                for ip_address in ip_address_info.get("ip_addresses") or []
+            ]
+            segments = sorted(
+                set(
+                    segment_paths[vif.get("lport_attachment_id")]
+                    for vif in vifs
+                    if vif.get("lport_attachment_id") in segment_paths
+                )
+            )
+            host_vars = dict(
+                nsxt_external_id=vm_id,
+                nsxt_power_state=vm.get("power_state"),
+                nsxt_tags=vm.get("tags") or [],
+                nsxt_segments=segments,
+                nsxt_ip_addresses=ip_addresses,
+            )
+            if ip_addresses:
+                host_vars["ansible_host"] = ip_addresses[0]
+            for key, value in host_vars.items():
+                self.inventory.set_variable(name, key, value)
+
+            groups = ["power_%s" % (vm.get("power_state") or "unknown")]
+            for tag in host_vars["nsxt_tags"]:
+                if tag.get("scope"):
+                    groups.append("tag_%s_%s" % (tag["scope"], tag.get("tag")))
+                else:
+                    groups.append("tag_%s" % (tag.get("tag")))
+            groups.extend("segment_%s" % path.split("/")[-1] for path in segments)
+            for group in groups:
+                group = self.inventory.add_group(self._sanitize_group_name(group))
+                self.inventory.add_child(group, name)
+
+            strict = self.get_option("strict")
+            self._set_composite_vars(
+                self.get_option("compose"), host_vars, name, strict=strict
+            )
+            self._add_host_to_composed_groups(
+                self.get_option("groups"), host_vars, name, strict=strict
+            )
+            self._add_host_to_keyed_groups(
+                self.get_option("keyed_groups"), host_vars, name, strict=strict
+            )
@@ -18,7 +18,7 @@ __metaclass__ = type
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
+    vmware_facts_argument_spec,
     nsx_module_facts_execution,
 )
 
@@ -69,6 +69,100 @@ options:
         description: Display name
         required: false
         type: str
+    tags:
+        description:
+            - "Only return objects having all these tags (scope and/or tag)."
+            - "Tags are searched with the search API."
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            scope:
+                description: Tag scope
+                required: false
+                type: str
+            tag:
+                description: Tag value
+                required: false
+                type: str
+    name_regex:
+        description: Only return objects with a display name matching this regular expression.
+        required: false
+        type: str
+    parent_path:
+        description:
+            - "Only return objects with this parent path, a trailing '*' matches all paths starting with it."
+            - "Objects are searched with the search API."
+        required: false
+        type: str
+    query:
+        description:
+            - "Search API query (e.g. 'tags.scope:env AND tags.tag:prod') combined with the other filters."
+            - "Objects of this module type and parent are searched with it."
+        required: false
+        type: str
+    output_format:
+        description:
+            - "'list' returns objects as a list, 'indexed' returns them as a dict keyed by index_key."
+            - "With 'indexed', 'paths' maps the same keys to object paths."
+        required: false
+        default: list
+        choices:
+            - list
+            - indexed
+        type: str
+    index_key:
+        description:
+            - "Key of objects with output_format 'indexed'."
+            - "Objects with a display name already used are keyed by their id."
+        required: false
+        default: id
+        choices:
+            - id
+            - display_name
+        type: str
+    dest:
+        description:
+            - "Write objects to this file instead of returning them, one json object per line, gzip compressed when it ends with '.gz'."
+            - "Objects are written page by page as they are read, and only 'dest' and 'count' are returned."
+            - "Not used with display_name, and can't be used with output_format 'indexed'."
+        required: false
+        type: path
+    cacheable:
+        description:
+            - "Return the result in 'ansible_facts' under fact_name with a 'timestamp', so it is kept by the fact cache plugin."
+        required: false
+        default: false
+        type: boolean
+    max_age:
+        description:
+            - "Only used when cacheable is true."
+            - "Return facts of a previous call with the same options younger than this number of seconds, without calling the API."
+        required: false
+        default: 0
+        type: int
+    fact_name:
+        description:
+            - "Name of the fact returned when cacheable is true."
+            - "Defaults to 'nsxt_' and the result key of objects (eg: nsxt_segments)."
+        required: false
+        type: str
+    since:
+        description:
+            - "Only return objects created or modified since this watermark (_last_modified_time in milliseconds since epoch)."
+            - "Result has the new 'watermark' to pass to next call, objects modified at the watermark are returned again."
+            - "Objects marked for delete are not returned, their ids are in 'deleted_ids' of the result."
+            - "Objects are searched with the search API."
+        required: false
+        type: int
+    known_ids:
+        description:
+            - "Only used with since."
+            - "Ids of objects returned by previous calls, ids of objects which no longer exist are added to 'deleted_ids' of the result."
+            - "Ids of all objects are read for this with one more listing."
+        required: false
+        type: list
+        elements: str
     site:
         description: NSX site
         required: false
@@ -108,9 +202,8 @@ RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
+    argument_spec = vmware_facts_argument_spec()
     argument_spec.update(
-        display_name=dict(required=False, type="str"),
         site=dict(required=False, default="default", type="str"),
         enforcement_point=dict(required=False, default="default", type="str"),
     )
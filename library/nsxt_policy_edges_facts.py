@@ -18,8 +18,9 @@ __metaclass__ = type
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
+    vmware_facts_argument_spec,
     nsx_module_facts_execution,
+    nsx_edge_clusters_facts_execution,
 )
 
 ANSIBLE_METADATA = {
@@ -69,10 +70,117 @@ options:
         description: Display name
         required: false
         type: str
+    tags:
+        description:
+            - "Only return objects having all these tags (scope and/or tag)."
+            - "Tags are searched with the search API."
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            scope:
+                description: Tag scope
+                required: false
+                type: str
+            tag:
+                description: Tag value
+                required: false
+                type: str
+    name_regex:
+        description: Only return objects with a display name matching this regular expression.
+        required: false
+        type: str
+    parent_path:
+        description:
+            - "Only return objects with this parent path, a trailing '*' matches all paths starting with it."
+            - "Objects are searched with the search API."
+        required: false
+        type: str
+    query:
+        description:
+            - "Search API query (e.g. 'tags.scope:env AND tags.tag:prod') combined with the other filters."
+            - "Objects of this module type and parent are searched with it."
+        required: false
+        type: str
+    output_format:
+        description:
+            - "'list' returns objects as a list, 'indexed' returns them as a dict keyed by index_key."
+            - "With 'indexed', 'paths' maps the same keys to object paths."
+        required: false
+        default: list
+        choices:
+            - list
+            - indexed
+        type: str
+    index_key:
+        description:
+            - "Key of objects with output_format 'indexed'."
+            - "Objects with a display name already used are keyed by their id."
+        required: false
+        default: id
+        choices:
+            - id
+            - display_name
+        type: str
+    dest:
+        description:
+            - "Write objects to this file instead of returning them, one json object per line, gzip compressed when it ends with '.gz'."
+            - "Objects are written page by page as they are read, and only 'dest' and 'count' are returned."
+            - "Not used with display_name, and can't be used with output_format 'indexed'."
+        required: false
+        type: path
+    cacheable:
+        description:
+            - "Return the result in 'ansible_facts' under fact_name with a 'timestamp', so it is kept by the fact cache plugin."
+        required: false
+        default: false
+        type: boolean
+    max_age:
+        description:
+            - "Only used when cacheable is true."
+            - "Return facts of a previous call with the same options younger than this number of seconds, without calling the API."
+        required: false
+        default: 0
+        type: int
+    fact_name:
+        description:
+            - "Name of the fact returned when cacheable is true."
+            - "Defaults to 'nsxt_' and the result key of objects (eg: nsxt_segments)."
+        required: false
+        type: str
+    since:
+        description:
+            - "Only return objects created or modified since this watermark (_last_modified_time in milliseconds since epoch)."
+            - "Result has the new 'watermark' to pass to next call, objects modified at the watermark are returned again."
+            - "Objects marked for delete are not returned, their ids are in 'deleted_ids' of the result."
+            - "Objects are searched with the search API."
+        required: false
+        type: int
+    known_ids:
+        description:
+            - "Only used with since."
+            - "Ids of objects returned by previous calls, ids of objects which no longer exist are added to 'deleted_ids' of the result."
+            - "Ids of all objects are read for this with one more listing."
+        required: false
+        type: list
+        elements: str
     cluster_id:
-        description: NSX edge cluster ID
-        required: true
+        description: NSX edge cluster ID, required unless all_clusters is true
+        required: false
         type: str
+    all_clusters:
+        description:
+            - "Return edge nodes of all edge clusters of site and enforcement point in 'clusters', a dict keyed by edge cluster ID."
+            - "Edge nodes of edge clusters are read with parallel API calls, and tags, name_regex and parent_path filter edge nodes read."
+            - "Can't be used with cluster_id, display_name, query, dest, since or known_ids, and output_format must be list and index_key id."
+        required: false
+        default: false
+        type: boolean
+    parallel_requests:
+        description: Maximum number of API calls sent at the same time with all_clusters.
+        required: false
+        default: 4
+        type: int
     site:
         description: NSX site
         required: false
@@ -83,21 +191,6 @@ options:
         required: false
         type: str
         default: default
-    tags:
-        description:
-            - "Opaque identifiers meaningful to the API user"
-            - "Maximum items : 30"
-        type: list
-        suboptions:
-            scope:
-                description: "Tag searches may optionally be restricted by scope"
-                required: false
-                type: str
-            tag:
-                description: "Identifier meaningful to user with maximum length of 256 characters"
-                required: true
-                type: str
-
 """
 
 EXAMPLES = """
@@ -121,6 +214,15 @@ nsxt_policy_edges_facts:
     cluster_id: "812093c4-7083-4c07-a668-5e96a1d3c6a4"
 register: nsxt_edges
 
+# Returns facts for edges of all edge clusters
+nsxt_policy_edges_facts:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    all_clusters: true
+register: nsxt_clusters_edges
+
 """
 
 
@@ -128,24 +230,32 @@ RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
+    argument_spec = vmware_facts_argument_spec()
     argument_spec.update(
-        display_name=dict(required=False, type="str"),
-        cluster_id=dict(required=True, type="str"),
+        cluster_id=dict(required=False, type="str"),
+        all_clusters=dict(required=False, type="bool", default=False),
+        parallel_requests=dict(required=False, type="int", default=4),
         site=dict(required=False, default="default", type="str"),
         enforcement_point=dict(required=False, default="default", type="str"),
-        tags=dict(required=False, type="list"),
     )
 
     module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
 
     api_endpoint = "edge-nodes"
     object_def = "edge-node"
-    manager_url = "https://{}/policy/api/v1/infra/sites/{}/enforcement-points/{}/edge-clusters/{}".format(
-        module.params["hostname"],
-        module.params["site"],
-        module.params["enforcement_point"],
-        module.params["cluster_id"],
+    enforcement_point_url = (
+        "https://{}/policy/api/v1/infra/sites/{}/enforcement-points/{}".format(
+            module.params["hostname"],
+            module.params["site"],
+            module.params["enforcement_point"],
+        )
+    )
+    if module.params["all_clusters"]:
+        nsx_edge_clusters_facts_execution(module, enforcement_point_url)
+    elif not module.params["cluster_id"]:
+        module.fail_json(msg="Missing parameter cluster_id")
+    manager_url = "{}/edge-clusters/{}".format(
+        enforcement_point_url, module.params["cluster_id"]
     )
 
     nsx_module_facts_execution(
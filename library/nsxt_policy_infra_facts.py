@@ -0,0 +1,188 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2019 Forterro
+# Copyright 2018 VMware, Inc.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible.module_utils.vmware_nsxt_policy_apis import (
+    vmware_facts_argument_spec,
+    nsx_infra_facts_execution,
+)
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community",
+}
+
+DOCUMENTATION = """
+---
+module: nsxt_policy_infra_facts
+
+short_description: Get NSX-T infra objects facts with one hierarchical policy API call
+
+description: >
+    Returns infra objects tree read with one hierarchical API call, flattened in a list of
+    objects (without their children), parents before their children. type_filter and base_path
+    select the object types and the part of the tree returned by NSX manager.
+
+version_added: "2.9"
+
+author: Olivier Gintrand
+
+options:
+    hostname:
+        description: Deployed NSX manager hostname.
+        required: true
+        type: str
+    username:
+        description: The username to authenticate with the NSX manager.
+        required: true
+        type: str
+    password:
+        description: The password to authenticate with the NSX manager.
+        required: true
+        type: str
+    validate_certs:
+        description: Insecure connection to NSX manager.
+        required: false
+        default: true
+        type: boolean
+    port:
+        description: NSX manager api port
+        required: false
+        default: 443
+        type: int
+    type_filter:
+        description: Resource types of objects returned (e.g. Tier1, Segment, Group).
+        required: false
+        type: list
+        elements: str
+    filter:
+        description:
+            - Filter of objects returned, as in 'filter' param of hierarchical API (e.g. 'Tier1|Segment'),
+              appended to 'Type-' when it doesn't start with it.
+            - Objects of all types are returned by default ('Type-.*').
+        required: false
+        type: str
+    base_path:
+        description: Path of the tree root, only objects under it are returned (e.g. /infra/tier-1s/My_first_tier1s).
+        required: false
+        type: str
+    tags:
+        description: Only return objects having all these tags (scope and/or tag).
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            scope:
+                description: Tag scope
+                required: false
+                type: str
+            tag:
+                description: Tag value
+                required: false
+                type: str
+    name_regex:
+        description: Only return objects with a display name matching this regular expression.
+        required: false
+        type: str
+    parent_path:
+        description: Only return objects with this parent path, a trailing '*' matches all paths starting with it.
+        required: false
+        type: str
+    output_format:
+        description: "'list' returns objects as a list, 'indexed' returns them as a dict keyed by path."
+        required: false
+        default: list
+        choices:
+            - list
+            - indexed
+        type: str
+    dest:
+        description:
+            - "Write objects to this file instead of returning them, one json object per line, gzip compressed when it ends with '.gz'."
+            - "Only 'dest', 'count' and 'counts' are returned."
+        required: false
+        type: path
+    cacheable:
+        description:
+            - "Return the result in 'ansible_facts' under fact_name with a 'timestamp', so it is kept by the fact cache plugin."
+        required: false
+        default: false
+        type: boolean
+    max_age:
+        description:
+            - "Only used when cacheable is true."
+            - "Return facts of a previous call with the same options younger than this number of seconds, without calling the API."
+        required: false
+        default: 0
+        type: int
+    fact_name:
+        description:
+            - "Name of the fact returned when cacheable is true."
+            - "Defaults to 'nsxt_infra'."
+        required: false
+        type: str
+"""
+
+EXAMPLES = """
+
+# Returns tier-1s, segments and groups with their parents
+nsxt_policy_infra_facts:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    type_filter:
+        - Tier1
+        - Segment
+        - Group
+    output_format: indexed
+register: nsxt_infra
+
+# Writes all objects under a tier-1 to a compressed file
+nsxt_policy_infra_facts:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    base_path: "/infra/tier-1s/My_first_tier1s"
+    dest: "/tmp/tier1.json.gz"
+
+"""
+
+
+RETURN = """# """
+
+
+def main():
+    argument_spec = vmware_facts_argument_spec()
+    for param in ["display_name", "query", "index_key", "since", "known_ids"]:
+        argument_spec.pop(param)
+    argument_spec.update(
+        type_filter=dict(required=False, type="list", elements="str"),
+        filter=dict(required=False, type="str"),
+        base_path=dict(required=False, type="str"),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    nsx_infra_facts_execution(module)
+
+
+if __name__ == "__main__":
+    main()
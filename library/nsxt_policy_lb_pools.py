@@ -15,11 +15,9 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible.module_utils.basic import AnsibleModule
-
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
-    nsx_module_execution,
+    get_nsx_resource_write_module,
+    nsx_resource_module_execution,
 )
 
 
@@ -73,6 +71,71 @@ options:
         - "'absent' is used to delete resource."
     required: true
     type: str
+  wait:
+    description:
+      - "Wait for the change to be realized before returning."
+      - "When false, the module returns as soon as the change is submitted, with
+        'intent_paths' and 'revision' to be passed to nsxt_policy_wait module."
+    required: false
+    default: true
+    type: boolean
+  items:
+    description:
+      - "List of objects to manage with one call. Each item takes the module
+        options (display_name, state...) and task options are used as defaults."
+      - "Objects are read with one listing and created, updated or deleted with
+        one hierarchical API call. Result has one entry per item in 'results'."
+      - "Parent options (domain, tier0, tier1, locale_service, segment, ippool)
+        are shared by all items. Required options can be set for each item."
+      - "Looping over the module with 'loop' is folded in the same way by the
+        role action plugin."
+    required: false
+    type: list
+    elements: dict
+  batch_size:
+    description:
+      - "Only used with items (or a folded loop)."
+      - "Maximum number of changed objects sent in one hierarchical API call, 0 sends
+        all of them in one call."
+      - "When a call fails, only items of that call are reported as failed."
+    required: false
+    default: 0
+    type: int
+  parallel_batches:
+    description:
+      - "Maximum number of hierarchical API calls sent at the same time when items
+        are split by batch_size."
+    required: false
+    default: 1
+    type: int
+  state_hash:
+    description:
+      - "Record hash of applied params in a tag with 'ansible-state-hash' scope."
+      - "Next runs consider the object up to date without comparing it when the
+        tag matches params and the object was not modified since (its revision
+        is in the tag), so out of band changes are still detected."
+      - "Objects without tag or with an outdated tag are updated to record it."
+    required: false
+    default: false
+    type: boolean
+  full_compare:
+    description:
+      - "Only used when state_hash is true."
+      - "Compare the whole object with params even if its state hash tag matches."
+    required: false
+    default: false
+    type: boolean
+  log_level:
+    description:
+      - "Return messages of this level and below in 'debug' key of result."
+      - "NSXT_POLICY_LOG_LEVEL environment variable is used when not set."
+    required: false
+    choices:
+      - error
+      - warning
+      - info
+      - debug
+    type: str
   display_name:
     description:
         - "Identifier to use when displaying entity in logs or GUI"
@@ -326,56 +389,9 @@ RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
-    argument_spec.update(
-        display_name=dict(required=True, type="str"),
-        description=dict(required=False, type="str"),
-        state=dict(required=True, choices=["present", "absent"]),
-        active_monitor_paths=dict(required=False, type="list"),
-        algorithm=dict(required=False, type="str", default="ROUND_ROBIN"),
-        member_group=dict(required=False, type="dict"),
-        members=dict(required=False, type="list"),
-        min_active_members=dict(required=False, type="int", default=1),
-        passive_monitor_path=dict(required=False, type="str"),
-        snat_translation=dict(required=False, type="dict"),
-        tcp_multiplexing_enabled=dict(required=False, type="bool", default=False),
-        tcp_multiplexing_number=dict(required=False, type="int", default=6),
-        tags=dict(required=False, type="list"),
-    )
-
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-
-    api_endpoint = "lb-pools"  # Define API endpoint for object (eg: segments)
-    object_def = "lb-pool"  # Define object name (eg: segment)
-
-    # Define api params to remove from returned object to get same object as ansible object
-    api_params_to_remove = ["resource_type"]
-
-    # Define read only params to fail module if call try to update
-    api_protected_params = []
-
-    # Define params from ansible to remove for correct object as nsx api object
-    ansible_params_to_remove = []
-
-    manager_url = "https://{}/policy/api/v1/infra".format(module.params["hostname"])
-
-    if not bool(module.params["snat_translation"]):
-        module.params["snat_translation"] = {}
-        module.params["snat_translation"]["type"] = "LBSnatAutoMap"
-
-    if bool(module.params["member_group"]):
-        if not "ip_revision_filter" in module.params["member_group"]:
-            module.params["member_group"]["ip_revision_filter"] = "IPV4"
+    module = get_nsx_resource_write_module("lb_pools")
 
-    nsx_module_execution(
-        module=module,
-        manager_url=manager_url,
-        api_endpoint=api_endpoint,
-        object_def=object_def,
-        api_params_to_remove=api_params_to_remove,
-        api_protected_params=api_protected_params,
-        ansible_params_to_remove=ansible_params_to_remove,
-    )
+    nsx_resource_module_execution(module, "lb_pools")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,236 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2019 Forterro
+# Copyright 2018 VMware, Inc.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible.module_utils.vmware_nsxt_policy_apis import (
+    vmware_write_argument_spec,
+    set_nsx_module_log,
+    nsx_resources_execution,
+)
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community",
+}
+
+DOCUMENTATION = """
+---
+module: nsxt_policy_resource
+
+short_description: Manage many policy objects of any supported type in one call
+
+description: >
+    Create, update or delete objects of the types managed by write modules
+    (segments, groups, tier-1s...) mixed in one module call. Objects of the same type
+    and parent are read with one listing, and all changes are sent with hierarchical
+    API calls.
+
+version_added: "2.9"
+
+author: Olivier Gintrand
+
+options:
+    hostname:
+        description: Deployed NSX manager hostname.
+        required: true
+        type: str
+    username:
+        description: The username to authenticate with the NSX manager.
+        required: true
+        type: str
+    password:
+        description: The password to authenticate with the NSX manager.
+        required: true
+        type: str
+    validate_certs:
+        description: Insecure connection to NSX manager.
+        required: false
+        default: true
+        type: boolean
+    port:
+        description: NSX manager api port
+        required: false
+        default: 443
+        type: int
+    resources:
+        description:
+            - "List of objects to manage. 'resource' gives the object type, as the name
+                of its write module without 'nsxt_policy_' (eg: segments,
+                inventory_groups, router_static_routes)."
+            - "Each resource takes the options of its write module ('display_name',
+                'state', parent options like domain or tier1, and api params of the
+                object), checked and completed with defaults like module options."
+            - "Options of this module are defaults of resources, a parent option set
+                by a resource replaces its alternatives (eg: tier1 of a resource
+                with tier0 set for the module)."
+            - "'cascade' deletes object with all its children, like in write modules."
+            - "Parents must be listed before their children when both are created in
+                the same call. Result has one entry per resource in 'results'."
+        required: true
+        type: list
+        elements: dict
+    state:
+        description: Default state of resources.
+        required: false
+        choices:
+            - present
+            - absent
+        type: str
+    domain:
+        description: Default domain of resources (groups, security policies).
+        required: false
+        default: default
+        type: str
+    tier0:
+        description: Default tier-0 of resources.
+        required: false
+        type: str
+    tier1:
+        description: Default tier-1 of resources.
+        required: false
+        type: str
+    locale_service:
+        description: Default locale service of resources.
+        required: false
+        type: str
+    segment:
+        description: Default segment of resources.
+        required: false
+        type: str
+    ippool:
+        description: Default ip pool of resources.
+        required: false
+        type: str
+    wait:
+        description:
+            - "Wait for the changes to be realized before returning."
+            - "When false, the module returns as soon as the changes are submitted, with
+                'intent_paths' and 'revision' in each result to be passed to
+                nsxt_policy_wait module."
+        required: false
+        default: true
+        type: boolean
+    batch_size:
+        description:
+            - "Maximum number of changed objects sent in one hierarchical API call, 0 sends
+                all of them in one call."
+            - "When a call fails, only resources of that call are reported as failed."
+        required: false
+        default: 0
+        type: int
+    parallel_batches:
+        description:
+            - "Maximum number of hierarchical API calls sent at the same time when
+                resources are split by batch_size."
+            - "Resources are sent after calls creating or updating their parent
+                (eg: locale services after their tier-1), other dependencies (eg:
+                segment connectivity_path) are not ordered."
+        required: false
+        default: 1
+        type: int
+    state_hash:
+        description:
+            - "Record hash of applied params in a tag with 'ansible-state-hash' scope."
+            - "Next runs consider the object up to date without comparing it when the
+                tag matches params and the object was not modified since (its revision
+                is in the tag), so out of band changes are still detected."
+            - "Objects without tag or with an outdated tag are updated to record it."
+        required: false
+        default: false
+        type: boolean
+    full_compare:
+        description:
+            - "Only used when state_hash is true."
+            - "Compare the whole object with params even if its state hash tag matches."
+        required: false
+        default: false
+        type: boolean
+    log_level:
+        description:
+            - "Return messages of this level and below in 'debug' key of result."
+            - "NSXT_POLICY_LOG_LEVEL environment variable is used when not set."
+        required: false
+        choices:
+            - error
+            - warning
+            - info
+            - debug
+        type: str
+"""
+
+EXAMPLES = """
+
+# Tier-1, its segments and a group with one hierarchical API call
+nsxt_policy_resource:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    state: present
+    resources:
+        - resource: tier1s
+          display_name: "My_first_tier1s"
+          tier0_path: "/infra/tier-0s/My_first_tier0s"
+        - resource: segments
+          display_name: "My_first_segments"
+          connectivity_path: "/infra/tier-1s/My_first_tier1s"
+          transport_zone_path: "/infra/sites/default/enforcement-points/default/transport-zones/e0de84fc-9438-4603-b8fd-306624b1b18c"
+          subnets:
+            - gateway_address: "10.0.0.1/24"
+        - resource: router_static_routes
+          tier1: "My_first_tier1s"
+          display_name: "default"
+          network: "0.0.0.0/0"
+          next_hops:
+            - ip_address: "10.0.0.254"
+        - resource: inventory_groups
+          display_name: "My_first_group"
+          expression:
+            - resource_type: "Condition"
+              member_type: "Segment"
+              key: "Tag"
+              operator: "EQUALS"
+              value: "web"
+"""
+
+RETURN = """# """
+
+
+def main():
+    argument_spec = vmware_write_argument_spec()
+    argument_spec.pop("items")
+    argument_spec.update(
+        resources=dict(required=True, type="list", elements="dict"),
+        state=dict(required=False, choices=["present", "absent"]),
+        domain=dict(required=False, type="str", default="default"),
+        tier0=dict(required=False, type="str"),
+        tier1=dict(required=False, type="str"),
+        locale_service=dict(required=False, type="str"),
+        segment=dict(required=False, type="str"),
+        ippool=dict(required=False, type="str"),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    set_nsx_module_log(module)
+
+    nsx_resources_execution(module)
+
+
+if __name__ == "__main__":
+    main()
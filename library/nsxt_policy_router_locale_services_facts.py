@@ -18,8 +18,9 @@ __metaclass__ = type
 from ansible.module_utils.basic import AnsibleModule
 
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
+    vmware_facts_argument_spec,
     nsx_module_facts_execution,
+    nsx_routers_facts_execution,
 )
 
 ANSIBLE_METADATA = {
@@ -69,14 +70,121 @@ options:
         description: Display name
         required: false
         type: str
+    tags:
+        description:
+            - "Only return objects having all these tags (scope and/or tag)."
+            - "Tags are searched with the search API."
+        required: false
+        type: list
+        elements: dict
+        suboptions:
+            scope:
+                description: Tag scope
+                required: false
+                type: str
+            tag:
+                description: Tag value
+                required: false
+                type: str
+    name_regex:
+        description: Only return objects with a display name matching this regular expression.
+        required: false
+        type: str
+    parent_path:
+        description:
+            - "Only return objects with this parent path, a trailing '*' matches all paths starting with it."
+            - "Objects are searched with the search API."
+        required: false
+        type: str
+    query:
+        description:
+            - "Search API query (e.g. 'tags.scope:env AND tags.tag:prod') combined with the other filters."
+            - "Objects of this module type and parent are searched with it."
+        required: false
+        type: str
+    output_format:
+        description:
+            - "'list' returns objects as a list, 'indexed' returns them as a dict keyed by index_key."
+            - "With 'indexed', 'paths' maps the same keys to object paths."
+        required: false
+        default: list
+        choices:
+            - list
+            - indexed
+        type: str
+    index_key:
+        description:
+            - "Key of objects with output_format 'indexed'."
+            - "Objects with a display name already used are keyed by their id."
+        required: false
+        default: id
+        choices:
+            - id
+            - display_name
+        type: str
+    dest:
+        description:
+            - "Write objects to this file instead of returning them, one json object per line, gzip compressed when it ends with '.gz'."
+            - "Objects are written page by page as they are read, and only 'dest' and 'count' are returned."
+            - "Not used with display_name, and can't be used with output_format 'indexed'."
+        required: false
+        type: path
+    cacheable:
+        description:
+            - "Return the result in 'ansible_facts' under fact_name with a 'timestamp', so it is kept by the fact cache plugin."
+        required: false
+        default: false
+        type: boolean
+    max_age:
+        description:
+            - "Only used when cacheable is true."
+            - "Return facts of a previous call with the same options younger than this number of seconds, without calling the API."
+        required: false
+        default: 0
+        type: int
+    fact_name:
+        description:
+            - "Name of the fact returned when cacheable is true."
+            - "Defaults to 'nsxt_' and the result key of objects (eg: nsxt_segments)."
+        required: false
+        type: str
+    since:
+        description:
+            - "Only return objects created or modified since this watermark (_last_modified_time in milliseconds since epoch)."
+            - "Result has the new 'watermark' to pass to next call, objects modified at the watermark are returned again."
+            - "Objects marked for delete are not returned, their ids are in 'deleted_ids' of the result."
+            - "Objects are searched with the search API."
+        required: false
+        type: int
+    known_ids:
+        description:
+            - "Only used with since."
+            - "Ids of objects returned by previous calls, ids of objects which no longer exist are added to 'deleted_ids' of the result."
+            - "Ids of all objects are read for this with one more listing."
+        required: false
+        type: list
+        elements: str
     tier0:
         description: Identifier for concerned tier0 (display_name), mutually exclusive with tier1
-        required: true
+        required: false
         type: str
     tier1:
         description: Identifier for concerned tier1 (display_name), mutually exclusive with tier0
-        required: true
+        required: false
         type: str
+    all_routers:
+        description:
+            - "Return locale services (and interfaces of locale services) of all tier-0s and tier-1s in 'routers', a dict keyed by router path."
+            - "Routers and their objects are read with parallel API calls, and tags, name_regex and parent_path filter objects read."
+            - "Can't be used with tier0, tier1, display_name, query, dest, since or known_ids, and output_format must be list and index_key id."
+        required: false
+        default: false
+        type: boolean
+    parallel_requests:
+        description: Maximum number of API calls sent at the same time with all_routers.
+        required: false
+        default: 4
+        type: int
 """
 
 EXAMPLES = """
@@ -100,6 +208,16 @@ nsxt_policy_router_locale_services_facts:
     tier0: "my_tier0"
 register: nsxt_router_locale_services
 
+# Returns facts for locale_services of all routers
+nsxt_policy_router_locale_services_facts:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    all_routers: true
+    parallel_requests: 8
+register: nsxt_routers
+
 """
 
 
@@ -107,11 +225,12 @@ RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
+    argument_spec = vmware_facts_argument_spec()
     argument_spec.update(
-        display_name=dict(required=False, type="str"),
         tier0=dict(required=False, type="str"),
         tier1=dict(required=False, type="str"),
+        all_routers=dict(required=False, type="bool", default=False),
+        parallel_requests=dict(required=False, type="int", default=4),
     )
 
     module = AnsibleModule(
@@ -123,7 +242,11 @@ def main():
     api_endpoint = "locale-services"
     object_def = "locale-service"
 
-    if module.params["tier0"]:
+    if module.params["all_routers"]:
+        nsx_routers_facts_execution(
+            module, api_endpoint=api_endpoint, child_api_endpoint="interfaces"
+        )
+    elif module.params["tier0"]:
         manager_url = "https://{}/policy/api/v1/infra/tier-0s/{}".format(
             module.params["hostname"], module.params["tier0"]
         )
@@ -15,12 +15,9 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible.module_utils.basic import AnsibleModule
-
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
-    nsx_module_execution,
-    get_nsx_module_params,
+    get_nsx_resource_write_module,
+    nsx_resource_module_execution,
 )
 
 ANSIBLE_METADATA = {
@@ -74,6 +71,80 @@ options:
             - "'absent' is used to delete resource."
         required: true
         type: str
+    wait:
+        description:
+            - "Wait for the change to be realized before returning."
+            - "When false, the module returns as soon as the change is submitted, with
+                'intent_paths' and 'revision' to be passed to nsxt_policy_wait module."
+        required: false
+        default: true
+        type: boolean
+    items:
+        description:
+            - "List of objects to manage with one call. Each item takes the module
+                options (display_name, state...) and task options are used as defaults."
+            - "Objects are read with one listing and created, updated or deleted with
+                one hierarchical API call. Result has one entry per item in 'results'."
+            - "Parent options (domain, tier0, tier1, locale_service, segment, ippool)
+                are shared by all items. Required options can be set for each item."
+            - "Looping over the module with 'loop' is folded in the same way by the
+                role action plugin."
+        required: false
+        type: list
+        elements: dict
+    batch_size:
+        description:
+            - "Only used with items (or a folded loop)."
+            - "Maximum number of changed objects sent in one hierarchical API call, 0 sends
+                all of them in one call."
+            - "When a call fails, only items of that call are reported as failed."
+        required: false
+        default: 0
+        type: int
+    parallel_batches:
+        description:
+            - "Maximum number of hierarchical API calls sent at the same time when items
+                are split by batch_size."
+        required: false
+        default: 1
+        type: int
+    state_hash:
+        description:
+            - "Record hash of applied params in a tag with 'ansible-state-hash' scope."
+            - "Next runs consider the object up to date without comparing it when the
+                tag matches params and the object was not modified since (its revision
+                is in the tag), so out of band changes are still detected."
+            - "Objects without tag or with an outdated tag are updated to record it."
+        required: false
+        default: false
+        type: boolean
+    full_compare:
+        description:
+            - "Only used when state_hash is true."
+            - "Compare the whole object with params even if its state hash tag matches."
+        required: false
+        default: false
+        type: boolean
+    log_level:
+        description:
+            - "Return messages of this level and below in 'debug' key of result."
+            - "NSXT_POLICY_LOG_LEVEL environment variable is used when not set."
+        required: false
+        choices:
+            - error
+            - warning
+            - info
+            - debug
+        type: str
+    cascade:
+        description:
+            - "Only used when state is 'absent'."
+            - "Delete the segment and all its children (ports,
+                security profile binding maps...) with a single
+                hierarchical API call instead of deleting each child first."
+        required: false
+        default: false
+        type: boolean
     display_name:
         description:
             - "Identifier to use when displaying entity in logs or GUI"
@@ -95,17 +166,29 @@ options:
     connectivity_path:
         description:
             - "Policy path to the connecting Tier-0 or Tier-1."
+            - "Display name of the Tier-1 (or Tier-0) can be given instead of its path."
             - "Valid only for segments created under Infra."
         required: false
         type: str
     transport_zone_path:
         description:
             - "Policy path to the transport zone. Supported for VLAN backed segments as well as Overlay Segments."
+            - "Display name of the transport zone can be given instead of its path."
             - "This field is required for VLAN backed Segments."
             - "Auto assigned if only one transport zone exists in the enforcement point."
             - "Default transport zone is auto assigned for overlay segments if none specified."
         required: false
         type: str
+    site:
+        description: Site of the transport zone given by display name.
+        required: false
+        default: default
+        type: str
+    enforcement_point:
+        description: Enforcement point of the transport zone given by display name.
+        required: false
+        default: default
+        type: str
     advanced_config:
         required: false
         type: dict
@@ -230,6 +313,30 @@ nsxt_policy_segments:
       address_pool_paths:
         - "/infra/ip-pools/ippool-overlay1"
 
+# Delete segment with its ports
+nsxt_policy_segments:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    display_name: "My_first_segments"
+    transport_zone_path: "/infra/sites/default/enforcement-points/default/transport-zones/e0de84fc-9438-4603-b8fd-306624b1b18c"
+    state: absent
+    cascade: true
+
+# Many overlay segments with one listing and one hierarchical API call
+nsxt_policy_segments:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    state: present
+    transport_zone_path: "/infra/sites/default/enforcement-points/default/transport-zones/e0de84fc-9438-4603-b8fd-306624b1b18c"
+    items:
+        - display_name: "My_first_segments"
+        - display_name: "My_second_segments"
+          description: "My second segments"
+
 """
 
 
@@ -237,51 +344,9 @@ RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
-    argument_spec.update(
-        display_name=dict(required=True, type="str"),
-        description=dict(required=False, type="str"),
-        state=dict(required=True, choices=["present", "absent"]),
-        vlan_ids=dict(required=False, type="list"),
-        connectivity_path=dict(required=False, type="str"),
-        transport_zone_path=dict(required=True, type="str"),
-        advanced_config=dict(required=False, type="dict"),
-        subnets=dict(required=False, type="list"),
-        domain_name=dict(required=False, type="str"),
-        tags=dict(required=False, type="list"),
-    )
-
-    module = AnsibleModule(
-        argument_spec=argument_spec,
-        supports_check_mode=True,
-        mutually_exclusive=[["vlan_ids", "connectivity_path"], ["vlan_ids", "subnets"]],
-    )
-
-    api_endpoint = "segments"
-    object_def = "segment"
-
-    api_params_to_remove = ["resource_type", "type"]
-    api_protected_params = ["transport_zone_path"]
-    ansible_params_to_remove = []
-
-    manager_url = "https://{}/policy/api/v1/infra".format(module.params["hostname"])
-
-    # update advanced config
-    if module.params.__contains__("advanced_config"):
-        module.params["advanced_config"] = {}
-        module.params["advanced_config"]["hybrid"] = False
-        module.params["advanced_config"]["local_egress"] = False
-        module.params["advanced_config"]["connectivity"] = "ON"
+    module = get_nsx_resource_write_module("segments")
 
-    nsx_module_execution(
-        module=module,
-        manager_url=manager_url,
-        api_endpoint=api_endpoint,
-        object_def=object_def,
-        api_params_to_remove=api_params_to_remove,
-        api_protected_params=api_protected_params,
-        ansible_params_to_remove=ansible_params_to_remove,
-    )
+    nsx_resource_module_execution(module, "segments")
 
 
 if __name__ == "__main__":
@@ -15,11 +15,9 @@ from __future__ import absolute_import, division, print_function
 
 __metaclass__ = type
 
-from ansible.module_utils.basic import AnsibleModule
-
 from ansible.module_utils.vmware_nsxt_policy_apis import (
-    vmware_argument_spec,
-    nsx_module_execution,
+    get_nsx_resource_write_module,
+    nsx_resource_module_execution,
 )
 
 ANSIBLE_METADATA = {
@@ -75,6 +73,80 @@ options:
         - "'absent' is used to delete resource."
     required: true
     type: str
+  wait:
+    description:
+      - "Wait for the change to be realized before returning."
+      - "When false, the module returns as soon as the change is submitted, with
+        'intent_paths' and 'revision' to be passed to nsxt_policy_wait module."
+    required: false
+    default: true
+    type: boolean
+  items:
+    description:
+      - "List of objects to manage with one call. Each item takes the module
+        options (display_name, state...) and task options are used as defaults."
+      - "Objects are read with one listing and created, updated or deleted with
+        one hierarchical API call. Result has one entry per item in 'results'."
+      - "Parent options (domain, tier0, tier1, locale_service, segment, ippool)
+        are shared by all items. Required options can be set for each item."
+      - "Looping over the module with 'loop' is folded in the same way by the
+        role action plugin."
+    required: false
+    type: list
+    elements: dict
+  batch_size:
+    description:
+      - "Only used with items (or a folded loop)."
+      - "Maximum number of changed objects sent in one hierarchical API call, 0 sends
+        all of them in one call."
+      - "When a call fails, only items of that call are reported as failed."
+    required: false
+    default: 0
+    type: int
+  parallel_batches:
+    description:
+      - "Maximum number of hierarchical API calls sent at the same time when items
+        are split by batch_size."
+    required: false
+    default: 1
+    type: int
+  state_hash:
+    description:
+      - "Record hash of applied params in a tag with 'ansible-state-hash' scope."
+      - "Next runs consider the object up to date without comparing it when the
+        tag matches params and the object was not modified since (its revision
+        is in the tag), so out of band changes are still detected."
+      - "Objects without tag or with an outdated tag are updated to record it."
+    required: false
+    default: false
+    type: boolean
+  full_compare:
+    description:
+      - "Only used when state_hash is true."
+      - "Compare the whole object with params even if its state hash tag matches."
+    required: false
+    default: false
+    type: boolean
+  log_level:
+    description:
+      - "Return messages of this level and below in 'debug' key of result."
+      - "NSXT_POLICY_LOG_LEVEL environment variable is used when not set."
+    required: false
+    choices:
+      - error
+      - warning
+      - info
+      - debug
+    type: str
+  cascade:
+    description:
+      - "Only used when state is 'absent'."
+      - "Delete the tier1 and all its children (locale services,
+        interfaces, static routes...) with a single
+        hierarchical API call instead of deleting each child first."
+    required: false
+    default: false
+    type: boolean
   display_name:
     description:
         - "Identifier to use when displaying entity in logs or GUI"
@@ -134,7 +206,9 @@ options:
     type: list
     elements: str
   tier0_path:
-    description:  Specify Tier-1 connectivity to Tier-0 instance.
+    description:
+      - "Specify Tier-1 connectivity to Tier-0 instance."
+      - "Policy path or display name of the Tier-0."
     type: str
     required: false
   type:
@@ -244,82 +318,25 @@ nsxt_policy_tier1s:
   validate_certs: false
   display_name: "My_first_tier1s"
   description: "My first tier1s automated created by Ansible for NSX-T policy"
+
+# Delete tier1 with its locale services, interfaces and static routes
+nsxt_policy_tier1s:
+  hostname: "nsxvip.domain.local"
+  username: "admin"
+  password: "Vmware1!"
+  validate_certs: false
+  display_name: "My_first_tier1s"
+  state: absent
+  cascade: true
 """
 
 RETURN = """# """
 
 
 def main():
-    argument_spec = vmware_argument_spec()
-    argument_spec.update(
-        display_name=dict(required=True, type="str"),
-        state=dict(required=True, choices=["present", "absent"]),
-        default_rule_logging=dict(required=False, type="bool", default=False),
-        description=dict(required=False, type="str"),
-        dhcp_config_paths=dict(required=False, type="list"),
-        disable_firewall=dict(required=False, type="bool", default=False),
-        enable_standby_relocation=dict(required=False, type="bool", default=False),
-        failover_mode=dict(
-            required=False,
-            type="str",
-            default="NON_PREEMPTIVE",
-            choices=["NON_PREEMPTIVE", "PREEMPTIVE"],
-        ),
-        force_whitelisting=dict(required=False, type="bool", default=False),
-        ipv6_profile_paths=dict(
-            required=False,
-            type="list",
-            default=[
-                "/infra/ipv6-ndra-profiles/default",
-                "/infra/ipv6-dad-profiles/default",
-            ],
-        ),
-        tier0_path=dict(required=False, type="str"),
-        type=dict(
-            required=False,
-            type="str",
-            choices=["ROUTED", "ISOLATED", "NATTED"],
-            default="ROUTED",
-        ),
-        route_advertisement_rules=dict(required=False, type="list"),
-        route_advertisement_types=dict(
-            required=False,
-            type="list",
-            choices=[
-                "TIER1_STATIC_ROUTES",
-                "TIER1_CONNECTED",
-                "TIER1_NAT",
-                "TIER1_LB_VIP",
-                "TIER1_LB_SNAT",
-                "TIER1_DNS_FORWARDER_IP",
-                "TIER1_IPSEC_LOCAL_ENDPOINT",
-            ],
-        ),
-        tags=dict(required=False, type="list"),
-    )
-
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
-
-    api_endpoint = "tier-1s"
-    object_def = "tier-1"
-    api_params_to_remove = ["resource_type"]
-
-    api_protected_params = ["ha_mode", "transit_subnets", "internal_transit_subnets"]
-
-    # Define params from ansible to remove for correct object as nsx api object
-    ansible_params_to_remove = ["type"]
-
-    manager_url = "https://{}/policy/api/v1/infra".format(module.params["hostname"])
+    module = get_nsx_resource_write_module("tier1s")
 
-    nsx_module_execution(
-        module=module,
-        manager_url=manager_url,
-        api_endpoint=api_endpoint,
-        object_def=object_def,
-        api_params_to_remove=api_params_to_remove,
-        api_protected_params=api_protected_params,
-        ansible_params_to_remove=ansible_params_to_remove,
-    )
+    nsx_resource_module_execution(module, "tier1s")
 
 
 if __name__ == "__main__":
@@ -17,11 +17,17 @@ __metaclass__ = type
 
 from ansible.module_utils.basic import AnsibleModule
 
-from ansible.module_utils.vmware_nsxt_policy_apis import vmware_argument_spec, request
+from ansible.module_utils.vmware_nsxt_policy_apis import (
+    vmware_argument_spec,
+    request,
+    escape_nsx_search_value,
+    get_nsx_search_url,
+)
 
 import json, time
 
 from ansible.module_utils._text import to_native
+from ansible.module_utils.six.moves.urllib.parse import quote
 
 ANSIBLE_METADATA = {
     "metadata_version": "1.1",
@@ -67,8 +73,20 @@ options:
     default: 443
     type: int
   virtual_machine:
-    description: "Display name for concerned virtual machine"
-    required: true
+    description:
+      - "Display name for concerned virtual machine"
+      - "The module fails when many virtual machines have this name, use external_id
+        or bios_uuid for them."
+      - "One of virtual_machine, external_id or bios_uuid is required."
+    required: false
+    type: str
+  external_id:
+    description: "External id (vCenter instance uuid) of concerned virtual machine"
+    required: false
+    type: str
+  bios_uuid:
+    description: "BIOS uuid of concerned virtual machine, found with the search API"
+    required: false
     type: str
   tags:
     description: "Keys values for tags"
@@ -91,18 +109,42 @@ nsxt_policy_virtual_machines_tags:
   tags:
     - scope: string01
       tag: string01
+
+nsxt_policy_virtual_machines_tags:
+  hostname: "nsxvip.domain.local"
+  username: "admin"
+  password: "Vmware1!"
+  validate_certs: false
+  external_id: "5007f8a1-3b5e-8c5d-2c4e-9b1a7f6d0e21"
+  tags:
+    - scope: string01
+      tag: string01
 """
 
 RETURN = """# """
 
 
-def get_vm(vm_name, manager_url, mgr_username, mgr_password, validate_certs):
-    my_vm = None
+# Get the virtual machine with one filtered request (display_name or external_id
+# filter of the list, search api for bios uuid) instead of listing all of them
+def get_vm(module, manager_url, mgr_username, mgr_password, validate_certs):
+    if module.params["external_id"]:
+        key, value = "external_id", module.params["external_id"]
+        url = "%s?external_id=%s" % (manager_url, quote(value))
+    elif module.params["bios_uuid"]:
+        key, value = "bios_uuid", module.params["bios_uuid"]
+        url = get_nsx_search_url(
+            manager_url,
+            "resource_type:VirtualMachine AND compute_ids:%s"
+            % escape_nsx_search_value("biosUuid:" + value),
+        )
+    else:
+        key, value = "name", module.params["virtual_machine"]
+        url = "%s?display_name=%s" % (manager_url, quote(value))
     try:
         headers = dict(Accept="application/json")
         headers["Content-Type"] = "application/json"
         (rc, resp) = request(
-            url=manager_url,
+            url=url,
             url_username=mgr_username,
             url_password=mgr_password,
             validate_certs=validate_certs,
@@ -111,14 +153,16 @@ def get_vm(vm_name, manager_url, mgr_username, mgr_password, validate_certs):
         )
     except Exception as err:
         module.fail_json(
-            msg="Error getting  %s objects list. Error [%s]"
-            % (object_def, to_native(err))
+            msg="Error getting virtual machine. Error [%s]" % (to_native(err))
         )
-    for vm in resp["results"]:
-        if vm["display_name"] == vm_name:
-            my_vm = vm
-    if my_vm is not None:
-        return my_vm
+    vms = resp.get("results") or []
+    if len(vms) > 1:
+        module.fail_json(
+            msg="Virtual machine %s %s is not unique, found external_id %s"
+            % (key, value, sorted(vm["external_id"] for vm in vms))
+        )
+    if vms:
+        return vms[0]
     else:
         return None
 
@@ -165,12 +209,19 @@ def update_tags(
 def main():
     argument_spec = vmware_argument_spec()
     argument_spec.update(
-        virtual_machine=dict(required=True, type="str"),
+        virtual_machine=dict(required=False, type="str"),
+        external_id=dict(required=False, type="str"),
+        bios_uuid=dict(required=False, type="str"),
         tags=dict(required=True, type="list"),
         enforcement_point=dict(required=False, type="str", default="default"),
     )
 
-    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+    module = AnsibleModule(
+        argument_spec=argument_spec,
+        supports_check_mode=True,
+        required_one_of=[["virtual_machine", "external_id", "bios_uuid"]],
+        mutually_exclusive=[["virtual_machine", "external_id", "bios_uuid"]],
+    )
 
     base_url = "https://{}/policy/api/v1/fabric".format(
         module.params["hostname"]
@@ -181,7 +232,7 @@ def main():
     )
 
     vm = get_vm(
-        vm_name=module.params["virtual_machine"],
+        module=module,
         manager_url=get_vm_url,
         mgr_username=module.params["username"],
         mgr_password=module.params["password"],
@@ -214,7 +265,12 @@ def main():
     else:
         module.exit_json(
             failed=True,
-            msg="Unkown virtual machine %s" % (module.params["virtual_machine"]),
+            msg="Unkown virtual machine %s"
+            % (
+                module.params["virtual_machine"]
+                or module.params["external_id"]
+                or module.params["bios_uuid"]
+            ),
         )
 
 
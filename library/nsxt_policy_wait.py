@@ -0,0 +1,244 @@
+#!/usr/bin/python
+#
+# Copyright (c) 2019 Forterro
+# Copyright 2018 VMware, Inc.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+from ansible.module_utils.basic import AnsibleModule
+
+from ansible.module_utils.vmware_nsxt_policy_apis import vmware_argument_spec, request
+
+import time
+
+from ansible.module_utils._text import to_native
+from ansible.module_utils.six.moves.urllib.parse import quote
+
+ANSIBLE_METADATA = {
+    "metadata_version": "1.1",
+    "status": ["preview"],
+    "supported_by": "community",
+}
+
+DOCUMENTATION = """
+---
+module: nsxt_policy_wait
+
+short_description: Wait for changes submitted with wait=false to be realized
+
+description: >
+    Write modules called with wait=false return as soon as NSX-T accepted the change,
+    with the policy paths of the changed objects ('intent_paths') and the expected
+    revision. This module takes many of these results and blocks until all of them
+    are realized (or deleted), so independent changes can be submitted first and
+    waited for once.
+
+version_added: "2.9"
+
+author: Olivier Gintrand
+
+options:
+  hostname:
+    description: Deployed NSX manager hostname.
+    required: true
+    type: str
+  username:
+    description: The username to authenticate with the NSX manager.
+    required: true
+    type: str
+  password:
+    description: The password to authenticate with the NSX manager.
+    required: true
+    type: str
+  validate_certs:
+    description: Insecure connection to NSX manager.
+    required: false
+    default: true
+    type: boolean
+  port:
+    description: NSX manager api port
+    required: false
+    default: 443
+    type: int
+  handles:
+    description:
+      - "Registered results of write modules called with wait=false."
+      - "Results of looped tasks (with a 'results' list) are accepted too."
+      - "Results without 'intent_paths' (unchanged objects) are ignored."
+    required: true
+    type: list
+    elements: dict
+  timeout:
+    description: "Maximum time in seconds to wait for all handles."
+    required: false
+    default: 300
+    type: int
+  poll_interval:
+    description: "Time in seconds between two realization checks."
+    required: false
+    default: 2
+    type: int
+"""
+
+EXAMPLES = """
+
+- nsxt_policy_segments:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    display_name: "{{ item }}"
+    transport_zone_path: "/infra/sites/default/enforcement-points/default/transport-zones/e0de84fc-9438-4603-b8fd-306624b1b18c"
+    state: present
+    wait: false
+  loop: "{{ segments }}"
+  register: segments_result
+
+- nsxt_policy_tier1s:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    display_name: "My_first_tier1s"
+    state: present
+    wait: false
+  register: tier1_result
+
+- nsxt_policy_wait:
+    hostname: "nsxvip.domain.local"
+    username: "admin"
+    password: "Vmware1!"
+    validate_certs: false
+    handles:
+      - "{{ segments_result }}"
+      - "{{ tier1_result }}"
+"""
+
+RETURN = """# """
+
+
+# Return intent paths and expected revisions from registered module results
+def get_pending_intents(handles):
+    pending = {}
+    for handle in handles:
+        if "results" in handle:
+            pending.update(get_pending_intents(handle["results"]))
+        for intent_path in handle.get("intent_paths") or []:
+            pending[intent_path] = handle.get("revision")
+    return pending
+
+
+def get_realization_status(
+    module, manager_url, intent_path, mgr_username, mgr_password, validate_certs
+):
+    try:
+        headers = dict(Accept="application/json")
+        headers["Content-Type"] = "application/json"
+        (rc, resp) = request(
+            url=manager_url
+            + "/infra/realized-state/status?intent_path=%s"
+            % quote(intent_path, safe="/"),
+            url_username=mgr_username,
+            url_password=mgr_password,
+            validate_certs=validate_certs,
+            ignore_errors=True,
+            headers=headers,
+        )
+    except Exception as err:
+        # nsx-t answers with a not found error once intent is deleted
+        if (
+            len(err.args) > 1
+            and isinstance(err.args[1], dict)
+            and err.args[1].get("httpStatus") == "NOT_FOUND"
+        ):
+            return None
+        module.fail_json(
+            msg="Error getting realization status for %s. Error [%s]"
+            % (intent_path, to_native(err))
+        )
+    return resp
+
+
+# Check if intent is realized with at least expected revision (or deleted if no revision)
+def is_realized(module, intent_path, revision, status):
+    if revision is None:
+        return status is None
+    if status is None:
+        module.fail_json(msg="Object %s doesn't exist" % (intent_path))
+
+    consolidated_status = status.get("consolidated_status", {}).get(
+        "consolidated_status"
+    )
+    if consolidated_status == "ERROR":
+        module.fail_json(
+            msg="Realization of %s failed" % (intent_path), realization=status
+        )
+    if "intent_version" in status and int(status["intent_version"]) < revision:
+        return False
+    # Nothing to realize on any enforcement point
+    if status.get("consolidated_status_per_enforcement_point") == []:
+        return True
+    return consolidated_status == "SUCCESS"
+
+
+def main():
+    argument_spec = vmware_argument_spec()
+    argument_spec.update(
+        handles=dict(required=True, type="list", elements="dict"),
+        timeout=dict(required=False, type="int", default=300),
+        poll_interval=dict(required=False, type="int", default=2),
+    )
+
+    module = AnsibleModule(argument_spec=argument_spec, supports_check_mode=True)
+
+    manager_url = "https://{}/policy/api/v1".format(module.params["hostname"])
+
+    pending = get_pending_intents(module.params["handles"])
+    realized = []
+    start = time.time()
+
+    # Check all pending intents on each round, so waits of handles overlap
+    while pending:
+        for intent_path, revision in list(pending.items()):
+            status = get_realization_status(
+                module=module,
+                manager_url=manager_url,
+                intent_path=intent_path,
+                mgr_username=module.params["username"],
+                mgr_password=module.params["password"],
+                validate_certs=module.params["validate_certs"],
+            )
+            if is_realized(module, intent_path, revision, status):
+                realized.append(intent_path)
+                pending.pop(intent_path)
+
+        if not pending:
+            break
+        if time.time() - start > module.params["timeout"]:
+            module.fail_json(
+                msg="Timeout waiting for realization of %s" % (", ".join(pending)),
+                realized=realized,
+                pending=list(pending),
+            )
+        time.sleep(module.params["poll_interval"])
+
+    module.exit_json(
+        changed=False,
+        realized=realized,
+        elapsed=int(time.time() - start),
+        msg="%s intents realized" % (len(realized)),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/env python
+#
+# Copyright (c) 2019 Forterro
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS" AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING,
+# BUT NOT LIMITED TO, THE IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE ARE DISCLAIMED.
+# IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL,
+# SPECIAL, EXEMPLARY, OR CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF SUBSTITUTE GOODS OR SERVICES;
+# LOSS OF USE, DATA, OR PROFITS; OR BUSINESS INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY,
+# WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
+# EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
+
+from __future__ import absolute_import, division, print_function
+
+__metaclass__ = type
+
+DOCUMENTATION = """
+---
+name: nsxt_policy_path
+
+short_description: Resolve NSX-T object names to policy paths
+
+description:
+    - "Returns policy path of objects given as 'type/name' (e.g. 'segments/web',
+        'transport_zones/overlay'), name being the display name or id of the object."
+    - "Objects of a type are read with one listing, indexed and kept in the local temporary
+        directory of the ansible run, so all lookups of all tasks share it. The listing is
+        read again once when a name is not found (object created by a previous task)."
+
+author: Olivier Gintrand
+
+options:
+    _terms:
+        description: "Objects as 'type/name'. Types are tier0s, tier1s, segments,
+            inventory_groups, security_policies, services, ippools, ipblocks, lb_pools,
+            lb_virtual_servers, load_balancers, lb_monitor_profiles, lb_app_profiles,
+            segments_security_profiles, transport_zones and edge_clusters."
+        required: true
+    hostname:
+        description: Deployed NSX manager hostname.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_HOSTNAME
+    username:
+        description: The username to authenticate with the NSX manager.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_USERNAME
+    password:
+        description: The password to authenticate with the NSX manager.
+        required: true
+        type: str
+        env:
+            - name: NSXT_POLICY_PASSWORD
+    validate_certs:
+        description: Insecure connection to NSX manager.
+        required: false
+        default: true
+        type: boolean
+    domain:
+        description: Domain of inventory_groups and security_policies.
+        required: false
+        default: default
+        type: str
+    site:
+        description: Site of transport_zones and edge_clusters.
+        required: false
+        default: default
+        type: str
+    enforcement_point:
+        description: Enforcement point of transport_zones and edge_clusters.
+        required: false
+        default: default
+        type: str
+"""
+
+EXAMPLES = """
+
+nsxt_policy_segments:
+    hostname: "{{ nsx_hostname }}"
+    username: "{{ nsx_username }}"
+    password: "{{ nsx_password }}"
+    display_name: "web"
+    transport_zone_path: "{{ lookup('nsxt_policy_path', 'transport_zones/overlay', hostname=nsx_hostname,
+        username=nsx_username, password=nsx_password) }}"
+    connectivity_path: "{{ lookup('nsxt_policy_path', 'tier1s/My_first_tier1s', hostname=nsx_hostname,
+        username=nsx_username, password=nsx_password) }}"
+    state: present
+"""
+
+RETURN = """
+_raw:
+    description: Policy paths of objects
+    type: list
+    elements: str
+"""
+
+import hashlib
+import json
+import os
+import sys
+import tempfile
+
+from ansible import constants as C
+from ansible.errors import AnsibleError
+from ansible.module_utils._text import to_native
+from ansible.module_utils.six.moves.urllib.parse import quote
+from ansible.module_utils.urls import open_url
+from ansible.plugins.loader import action_loader
+from ansible.plugins.lookup import LookupBase
+
+# Indexes of this process by index file path
+NSX_PATH_INDEX_FILES = {}
+
+
+# Return policy list paths by object type of module_utils, shared with write modules
+# resolving display names, loaded like nsxt_policy_local action plugin loads it
+def get_nsx_path_types():
+    local_action = action_loader.get("nsxt_policy_local", class_only=True)
+    if local_action is None:
+        raise AnsibleError("Action plugin nsxt_policy_local of the role isn't found")
+    return sys.modules[local_action.__module__].load_nsx_module_utils().NSX_PATH_TYPES
+
+
+class LookupModule(LookupBase):
+    def run(self, terms, variables=None, **kwargs):
+        self.set_options(var_options=variables, direct=kwargs)
+        base_url = "https://%s/policy/api/v1" % (self.get_option("hostname"))
+        nsx_path_types = get_nsx_path_types()
+
+        paths = []
+        for term in terms:
+            object_type, _, name = to_native(term).partition("/")
+            if object_type not in nsx_path_types or not name:
+                raise AnsibleError(
+                    "Invalid object %s, expected type/name with type in %s"
+                    % (term, ", ".join(sorted(nsx_path_types)))
+                )
+            list_url = base_url + nsx_path_types[object_type].format(
+                domain=self.get_option("domain"),
+                site=self.get_option("site"),
+                enforcement_point=self.get_option("enforcement_point"),
+            )
+            path = self.get_path(list_url, name, refresh=False)
+            if path is None:
+                path = self.get_path(list_url, name, refresh=True)
+            if path is None:
+                raise AnsibleError("No %s found with name %s" % (object_type, name))
+            paths.append(path)
+        return paths
+
+    # Return path of object with id or display name, None if not found
+    def get_path(self, list_url, name, refresh):
+        index = self.get_index(list_url, refresh)
+        if name in index["ids"]:
+            return index["ids"][name]
+        object_paths = index["names"].get(name, [])
+        if len(object_paths) > 1:
+            raise AnsibleError(
+                "Display name %s is not unique: %s" % (name, ", ".join(object_paths))
+            )
+        return object_paths[0] if object_paths else None
+
+    # Return index of objects of list url (paths by id and by display name), from the
+    # index file of the ansible run unless refresh is true
+    def get_index(self, list_url, refresh):
+        index_path = os.path.join(
+            C.DEFAULT_LOCAL_TMP,
+            "nsxt_policy_path_%s.json"
+            % hashlib.sha1(
+                (self.get_option("username") + "@" + list_url).encode("utf-8")
+            ).hexdigest(),
+        )
+        if not refresh:
+            if index_path in NSX_PATH_INDEX_FILES:
+                return NSX_PATH_INDEX_FILES[index_path]
+            try:
+                with open(index_path) as index_file:
+                    NSX_PATH_INDEX_FILES[index_path] = json.load(index_file)
+                return NSX_PATH_INDEX_FILES[index_path]
+            except (IOError, OSError, ValueError):
+                pass
+
+        index = dict(ids={}, names={})
+        for nsx_object in self.get_objects(list_url):
+            index["ids"][nsx_object["id"]] = nsx_object["path"]
+            index["names"].setdefault(nsx_object.get("display_name"), []).append(
+                nsx_object["path"]
+            )
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=C.DEFAULT_LOCAL_TMP)
+        with os.fdopen(tmp_fd, "w") as tmp_file:
+            json.dump(index, tmp_file)
+        os.rename(tmp_path, index_path)
+        NSX_PATH_INDEX_FILES[index_path] = index
+        return index
+
+    # Return objects of all pages of list url
+    def get_objects(self, url):
+        nsx_objects = []
+        cursor = None
+        while True:
+            page_url = url + "?included_fields=id,display_name,path"
+            if cursor:
+                page_url += "&cursor=%s" % (quote(cursor))
+            try:
+                resp = json.loads(
+                    open_url(
+                        page_url,
+                        headers=dict(Accept="application/json"),
+                        url_username=self.get_option("username"),
+                        url_password=self.get_option("password"),
+                        force_basic_auth=True,
+                        validate_certs=self.get_option("validate_certs"),
+                    ).read()
+                )
+            except Exception as err:
+                raise AnsibleError(
+                    "Error getting %s. Error [%s]" % (url, to_native(err))
+                )
+            nsx_objects.extend(resp.get("results") or [])
+            cursor = resp.get("cursor")
+            if not cursor or not resp.get("results"):
+                return nsx_objects
@@ -11,12 +11,666 @@
 # WHETHER IN CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE,
 # EVEN IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 
-import json, time, requests, urllib3
+import copy, fnmatch, hashlib, json, os, re, time
 from ansible.module_utils.basic import AnsibleModule
 from ansible.module_utils._text import to_native
-from requests.auth import HTTPBasicAuth
-from deepdiff import DeepDiff
-from pprint import pprint
+from ansible.module_utils.six import string_types
+from ansible.module_utils.six.moves.urllib.parse import quote
+
+try:
+    from ansible.module_utils.common.arg_spec import ArgumentSpecValidator
+
+    HAS_ARGUMENT_SPEC_VALIDATOR = True
+except ImportError:
+    HAS_ARGUMENT_SPEC_VALIDATOR = False
+
+# Filter of hierarchical api reads, without it children of objects are not returned
+HAPI_TYPE_FILTER = "Type-"
+HAPI_ALL_TYPES_FILTER = HAPI_TYPE_FILTER + ".*"
+
+# Module options selecting parent of nsx-t object, shared by all items
+NSX_PARENT_PARAMS = ["domain", "tier0", "tier1", "locale_service", "segment", "ippool"]
+
+# AnsibleModule options checking params together, also checked for each item
+NSX_ITEM_CONSTRAINTS = [
+    "mutually_exclusive",
+    "required_together",
+    "required_one_of",
+    "required_if",
+    "required_by",
+]
+
+# Hierarchical api (H-API) child types by api endpoint, used to build H-API bodies.
+# Child type of polymorphic objects (eg: interfaces) is given by their resource_type
+HAPI_CHILD_TYPES = {
+    "domains": "Domain",
+    "groups": "Group",
+    "ip-blocks": "IpAddressBlock",
+    "ip-pools": "IpAddressPool",
+    "ip-subnets": "IpAddressPoolSubnet",
+    "lb-monitor-profiles": "LBMonitorProfile",
+    "lb-pools": "LBPool",
+    "lb-services": "LBService",
+    "lb-virtual-servers": "LBVirtualServer",
+    "locale-services": "LocaleServices",
+    "ports": "SegmentPort",
+    "security-policies": "SecurityPolicy",
+    "segment-security-profile-binding-maps": "SegmentSecurityProfileBindingMap",
+    "segments": "Segment",
+    "static-routes": "StaticRoutes",
+    "tier-0s": "Tier0",
+    "tier-1s": "Tier1",
+}
+
+# Api endpoints of parent objects by module option
+NSX_PARENT_ENDPOINTS = {
+    "domain": "domains",
+    "ippool": "ip-pools",
+    "locale_service": "locale-services",
+    "segment": "segments",
+    "tier0": "tier-0s",
+    "tier1": "tier-1s",
+}
+
+# Nsx-t objects managed by write modules, by module name without 'nsxt_policy_'.
+# parents: options of parents in policy path order, a list gives alternative parents
+# variants: settings overridden by the parent option used (eg: tier0 or tier1)
+# api_params_to_remove: api params removed from nsx-t object before comparison
+# api_protected_params: read only params which can't be updated
+# ansible_params_to_remove: module options which aren't api params
+# argument_spec: module options, without options shared by write modules
+# mutually_exclusive: constraints of module options, also checked for each item
+# Defaults and list identity keys are in NSX_DEFAULT_PARAMS and NSX_LIST_IDENTITY_KEYS
+NSX_RESOURCES = {
+    "inventory_groups": dict(
+        api_endpoint="groups",
+        object_def="group",
+        parents=["domain"],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=["domain"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            domain=dict(required=False, type="str", default="default"),
+            expression=dict(required=False, type="list"),
+            extended_expression=dict(required=False, type="list"),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "ipblocks": dict(
+        api_endpoint="ip-blocks",
+        object_def="ip-block",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            tags=dict(required=False, type="list"),
+            cidr=dict(required=True, type="str"),
+        ),
+    ),
+    "ippools": dict(
+        api_endpoint="ip-pools",
+        object_def="ip-pool",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "ippools_static_subnets": dict(
+        api_endpoint="ip-subnets",
+        object_def="ip-subnet",
+        parents=["ippool"],
+        api_params_to_remove=["pool_usage"],
+        api_protected_params=["resource_type"],
+        ansible_params_to_remove=["ippool"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            ippool=dict(required=True, type="str"),
+            allocation_ranges=dict(required=True, type="list"),
+            cidr=dict(required=True, type="str"),
+            dns_nameservers=dict(required=False, type="list"),
+            dns_suffix=dict(required=False, type="str"),
+            gateway_ip=dict(required=False, type="str"),
+            resource_type=dict(
+                required=False, type="str", default="IpAddressPoolStaticSubnet"
+            ),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "lb_pools": dict(
+        api_endpoint="lb-pools",
+        object_def="lb-pool",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            active_monitor_paths=dict(required=False, type="list"),
+            algorithm=dict(required=False, type="str", default="ROUND_ROBIN"),
+            member_group=dict(required=False, type="dict"),
+            members=dict(required=False, type="list"),
+            min_active_members=dict(required=False, type="int", default=1),
+            passive_monitor_path=dict(required=False, type="str"),
+            snat_translation=dict(required=False, type="dict"),
+            tcp_multiplexing_enabled=dict(required=False, type="bool", default=False),
+            tcp_multiplexing_number=dict(required=False, type="int", default=6),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "lb_tcp_monitor_profiles": dict(
+        api_endpoint="lb-monitor-profiles",
+        object_def="lb-monitor-profile",
+        parents=[],
+        resource_type="LBTcpMonitorProfile",
+        api_params_to_remove=[],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            fall_count=dict(required=False, type="int", default=3),
+            interval=dict(required=False, type="int", default=5),
+            monitor_port=dict(required=False, type="int"),
+            receive=dict(required=False, type="str"),
+            rise_count=dict(required=False, type="int", default=3),
+            send=dict(required=False, type="str"),
+            timeout=dict(required=False, type="int", default=15),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "lb_virtual_servers": dict(
+        api_endpoint="lb-virtual-servers",
+        object_def="lb-virtual-server",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            access_log_enabled=dict(required=False, type="bool", default=False),
+            application_profile_path=dict(required=True, type="str"),
+            client_ssl_profile_binding=dict(required=False, type="dict"),
+            default_pool_member_ports=dict(required=False, type="list"),
+            enabled=dict(required=False, type="bool", default=True),
+            ip_address=dict(required=True, type="str"),
+            lb_persistence_profile_path=dict(required=False, type="str"),
+            lb_service_path=dict(required=False, type="str"),
+            max_concurrent_connections=dict(required=False, type="int"),
+            max_new_connection_rate=dict(required=False, type="int"),
+            pool_path=dict(required=False, type="str"),
+            ports=dict(required=True, type="list"),
+            rules=dict(required=False, type="str"),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "load_balancers": dict(
+        api_endpoint="lb-services",
+        object_def="lb-service",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=[],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            connectivity_path=dict(required=False, type="str"),
+            enabled=dict(required=False, type="bool", default=True),
+            error_log_level=dict(required=False, type="str", default="INFO"),
+            access_log_enabled=dict(required=False, type="bool", default=False),
+            size=dict(required=False, type="str", default="SMALL"),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "router_locale_services": dict(
+        api_endpoint="locale-services",
+        object_def="locale-service",
+        parents=[["tier0", "tier1"]],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=["ha_mode", "transit_subnets", "internal_transit_subnets"],
+        ansible_params_to_remove=["tier0", "tier1", "site", "enforcement_point"],
+        argument_spec=dict(
+            display_name=dict(required=False, type="str", default="default"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            tier0=dict(required=False, type="str"),
+            tier1=dict(required=False, type="str"),
+            edge_cluster_path=dict(required=True, type="str"),
+            site=dict(required=False, type="str", default="default"),
+            enforcement_point=dict(required=False, type="str", default="default"),
+            ha_vip_configs=dict(required=False, type="list"),
+            preferred_edge_paths=dict(required=False, type="list"),
+            route_redistribution_types=dict(
+                required=False,
+                type="list",
+                choices=[
+                    "TIER0_STATIC",
+                    "TIER0_CONNECTED",
+                    "TIER1_STATIC",
+                    "TIER0_EXTERNAL_INTERFACE",
+                    "TIER0_LOOPBACK_INTERFACE",
+                    "TIER0_SEGMENT",
+                    "TIER0_ROUTER_LINK",
+                    "TIER0_SERVICE_INTERFACE",
+                    "TIER0_DNS_FORWARDER_IP",
+                    "TIER0_IPSEC_LOCAL_IP",
+                    "TIER0_NAT",
+                    "TIER1_NAT",
+                    "TIER1_LB_VIP",
+                    "TIER1_LB_SNAT",
+                    "TIER1_DNS_FORWARDER_IP",
+                    "TIER1_CONNECTED",
+                    "TIER1_SERVICE_INTERFACE",
+                    "TIER1_SEGMENT",
+                    "TIER1_IPSEC_LOCAL_ENDPOINT",
+                ],
+            ),
+            tags=dict(required=False, type="list"),
+        ),
+        mutually_exclusive=[["tier0", "tier1"]],
+    ),
+    "router_locale_services_interfaces": dict(
+        api_endpoint="interfaces",
+        object_def="interface",
+        parents=[["tier0", "tier1"], "locale_service"],
+        variants=dict(
+            tier0=dict(
+                resource_type="Tier0Interface",
+                ansible_params_to_remove=["locale_service", "tier0", "tier1", "type"],
+            ),
+            tier1=dict(
+                resource_type="Tier1Interface",
+                ansible_params_to_remove=[
+                    "locale_service",
+                    "tier0",
+                    "tier1",
+                    "type",
+                    "edge_path",
+                ],
+            ),
+        ),
+        api_params_to_remove=[],
+        api_protected_params=[],
+        ansible_params_to_remove=["locale_service", "tier0", "tier1"],
+        argument_spec=dict(
+            display_name=dict(required=False, type="str", default="default"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            tier0=dict(required=False, type="str"),
+            tier1=dict(required=False, type="str"),
+            locale_service=dict(required=True, type="str"),
+            ipv6_profile_paths=dict(
+                required=False,
+                type="list",
+                default=["/infra/ipv6-ndra-profiles/default"],
+            ),
+            mtu=dict(required=False, type="int"),
+            segment_path=dict(required=True, type="str"),
+            subnets=dict(required=True, type="list"),
+            edge_path=dict(required=False, type="str"),
+            type=dict(
+                required=False,
+                type="str",
+                choices=["EXTERNAL", "SERVICE", "LOOPBACK"],
+                default="EXTERNAL",
+            ),
+            tags=dict(required=False, type="list"),
+        ),
+        mutually_exclusive=[["tier0", "tier1"]],
+    ),
+    "router_static_routes": dict(
+        api_endpoint="static-routes",
+        object_def="static-route",
+        parents=[["tier0", "tier1"]],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=["ha_mode", "transit_subnets", "internal_transit_subnets"],
+        ansible_params_to_remove=["tier0", "tier1"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            tier0=dict(required=False, type="str"),
+            tier1=dict(required=False, type="str"),
+            network=dict(required=True, type="str"),
+            next_hops=dict(required=False, type="list"),
+            tags=dict(required=False, type="list"),
+        ),
+        mutually_exclusive=[["tier0", "tier1"]],
+    ),
+    "security_policies": dict(
+        api_endpoint="security-policies",
+        object_def="security-policy",
+        parents=["domain"],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=["domain"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            domain=dict(required=False, type="str", default="default"),
+            tags=dict(required=False, type="list"),
+            category=dict(required=False, type="str"),
+            comments=dict(required=False, type="str"),
+            locked=dict(required=False, type="bool"),
+            rules=dict(required=False, type="list", elements="dict"),
+            scope=dict(required=False, type="list", elements="str"),
+            stateful=dict(required=False, type="bool"),
+            tcp_strict=dict(required=False, type="bool"),
+        ),
+    ),
+    "segments": dict(
+        api_endpoint="segments",
+        object_def="segment",
+        parents=[],
+        api_params_to_remove=["resource_type", "type"],
+        api_protected_params=["transport_zone_path"],
+        ansible_params_to_remove=["cascade", "site", "enforcement_point"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            cascade=dict(required=False, type="bool", default=False),
+            vlan_ids=dict(required=False, type="list"),
+            connectivity_path=dict(required=False, type="str"),
+            transport_zone_path=dict(required=True, type="str"),
+            site=dict(required=False, type="str", default="default"),
+            enforcement_point=dict(required=False, type="str", default="default"),
+            advanced_config=dict(required=False, type="dict"),
+            subnets=dict(required=False, type="list"),
+            domain_name=dict(required=False, type="str"),
+            tags=dict(required=False, type="list"),
+        ),
+        mutually_exclusive=[["vlan_ids", "connectivity_path"], ["vlan_ids", "subnets"]],
+    ),
+    "segments_ports": dict(
+        api_endpoint="ports",
+        object_def="port",
+        parents=["segment"],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=["segment"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            segment=dict(required=True, type="str"),
+            address_binding=dict(required=False, type="list"),
+            attachment=dict(required=False, type="dict"),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "segments_security_profiles": dict(
+        api_endpoint="segment-security-profile-binding-maps",
+        object_def="segment-security-profile-binding-map",
+        parents=["segment"],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=[],
+        ansible_params_to_remove=["segment"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            segment=dict(required=True, type="str"),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "tier0s": dict(
+        api_endpoint="tier-0s",
+        object_def="tier-0",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=["ha_mode", "transit_subnets", "internal_transit_subnets"],
+        ansible_params_to_remove=["cascade"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            description=dict(required=False, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            cascade=dict(required=False, type="bool", default=False),
+            dhcp_config_paths=dict(required=False, type="list"),
+            disable_firewall=dict(required=False, type="bool", default=False),
+            force_whitelisting=dict(required=False, type="bool", default=False),
+            default_rule_logging=dict(required=False, type="bool", default=False),
+            failover_mode=dict(
+                required=False,
+                type="str",
+                default="NON_PREEMPTIVE",
+                choices=["NON_PREEMPTIVE", "PREEMPTIVE"],
+            ),
+            ha_mode=dict(
+                required=False,
+                type="str",
+                default="ACTIVE_ACTIVE",
+                choices=["ACTIVE_ACTIVE", "ACTIVE_STANDBY"],
+            ),
+            transit_subnets=dict(
+                required=False, type="list", default=["100.64.0.0/16"]
+            ),
+            internal_transit_subnets=dict(
+                required=False, type="list", default=["169.254.0.0/24"]
+            ),
+            ipv6_profile_paths=dict(
+                required=False,
+                type="list",
+                default=[
+                    "/infra/ipv6-ndra-profiles/default",
+                    "/infra/ipv6-dad-profiles/default",
+                ],
+            ),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+    "tier1s": dict(
+        api_endpoint="tier-1s",
+        object_def="tier-1",
+        parents=[],
+        api_params_to_remove=["resource_type"],
+        api_protected_params=["ha_mode", "transit_subnets", "internal_transit_subnets"],
+        ansible_params_to_remove=["type", "cascade"],
+        argument_spec=dict(
+            display_name=dict(required=True, type="str"),
+            state=dict(required=True, choices=["present", "absent"]),
+            cascade=dict(required=False, type="bool", default=False),
+            default_rule_logging=dict(required=False, type="bool", default=False),
+            description=dict(required=False, type="str"),
+            dhcp_config_paths=dict(required=False, type="list"),
+            disable_firewall=dict(required=False, type="bool", default=False),
+            enable_standby_relocation=dict(required=False, type="bool", default=False),
+            failover_mode=dict(
+                required=False,
+                type="str",
+                default="NON_PREEMPTIVE",
+                choices=["NON_PREEMPTIVE", "PREEMPTIVE"],
+            ),
+            force_whitelisting=dict(required=False, type="bool", default=False),
+            ipv6_profile_paths=dict(
+                required=False,
+                type="list",
+                default=[
+                    "/infra/ipv6-ndra-profiles/default",
+                    "/infra/ipv6-dad-profiles/default",
+                ],
+            ),
+            tier0_path=dict(required=False, type="str"),
+            type=dict(
+                required=False,
+                type="str",
+                choices=["ROUTED", "ISOLATED", "NATTED"],
+                default="ROUTED",
+            ),
+            route_advertisement_rules=dict(required=False, type="list"),
+            route_advertisement_types=dict(
+                required=False,
+                type="list",
+                choices=[
+                    "TIER1_STATIC_ROUTES",
+                    "TIER1_CONNECTED",
+                    "TIER1_NAT",
+                    "TIER1_LB_VIP",
+                    "TIER1_LB_SNAT",
+                    "TIER1_DNS_FORWARDER_IP",
+                    "TIER1_IPSEC_LOCAL_ENDPOINT",
+                ],
+            ),
+            tags=dict(required=False, type="list"),
+        ),
+    ),
+}
+
+# Policy list path by object type, of objects which write module params can
+# reference by name (NSX_PATH_REFERENCES) and nsxt_policy_path lookup resolves
+NSX_PATH_TYPES = {
+    "tier0s": "/infra/tier-0s",
+    "tier1s": "/infra/tier-1s",
+    "segments": "/infra/segments",
+    "inventory_groups": "/infra/domains/{domain}/groups",
+    "security_policies": "/infra/domains/{domain}/security-policies",
+    "services": "/infra/services",
+    "ippools": "/infra/ip-pools",
+    "ipblocks": "/infra/ip-blocks",
+    "lb_pools": "/infra/lb-pools",
+    "lb_virtual_servers": "/infra/lb-virtual-servers",
+    "load_balancers": "/infra/lb-services",
+    "lb_monitor_profiles": "/infra/lb-monitor-profiles",
+    "lb_app_profiles": "/infra/lb-app-profiles",
+    "segments_security_profiles": "/infra/segment-security-profiles",
+    "transport_zones": "/infra/sites/{site}/enforcement-points/{enforcement_point}"
+    "/transport-zones",
+    "edge_clusters": "/infra/sites/{site}/enforcement-points/{enforcement_point}"
+    "/edge-clusters",
+}
+
+# Params of write modules taking object paths which also take display names (or
+# ids), by resource: param (list_param.param for params of list elements) and types
+# of referenced objects
+NSX_PATH_REFERENCES = {
+    "lb_virtual_servers": {
+        "application_profile_path": ["lb_app_profiles"],
+        "pool_path": ["lb_pools"],
+    },
+    "router_locale_services": {"edge_cluster_path": ["edge_clusters"]},
+    "security_policies": {
+        "rules.destination_groups": ["inventory_groups"],
+        "rules.services": ["services"],
+        "rules.source_groups": ["inventory_groups"],
+    },
+    "segments": {
+        "connectivity_path": ["tier1s", "tier0s"],
+        "transport_zone_path": ["transport_zones"],
+    },
+    "tier1s": {"tier0_path": ["tier0s"]},
+}
+
+# Search api resource types by api endpoint, when they aren't the H-API child type
+# (polymorphic objects or objects missing from HAPI_CHILD_TYPES)
+NSX_SEARCH_RESOURCE_TYPES = {
+    "edge-clusters": ["PolicyEdgeCluster"],
+    "edge-nodes": ["PolicyEdgeNode"],
+    "interfaces": ["Tier0Interface", "Tier1Interface"],
+    "ip-subnets": ["IpAddressPoolStaticSubnet", "IpAddressPoolBlockSubnet"],
+    "lb-monitor-profiles": [
+        "LBHttpMonitorProfile",
+        "LBHttpsMonitorProfile",
+        "LBIcmpMonitorProfile",
+        "LBPassiveMonitorProfile",
+        "LBTcpMonitorProfile",
+        "LBUdpMonitorProfile",
+    ],
+    "transport-zones": ["PolicyTransportZone"],
+}
+
+# Characters escaped in search api query values
+NSX_SEARCH_SPECIAL_CHARS = '+-&|!(){}[]^"~*?:\\/ '
+
+# Identity keys of list elements by list name, elements with same identity are
+# compared together whatever their position. First keys found in element are used
+NSX_LIST_IDENTITY_KEYS = {
+    "allocation_ranges": [["start", "end"]],
+    "members": [["ip_address", "port"]],
+    "next_hops": [["ip_address"]],
+    "rules": [["display_name"], ["id"]],
+    "subnets": [["gateway_address"]],
+    "tags": [["scope", "tag"]],
+}
+
+# Lists where order of elements is significant for nsx-t
+NSX_ORDERED_LISTS = [
+    "dns_nameservers",
+    "expression",
+    "nested_expressions",
+    "route_advertisement_rules",
+]
+
+# Defaults of nsx-t objects by api endpoint ("*" for all endpoints), applied to
+# params and to objects returned by api before comparing them.
+# "a.b" is the default of b in a when a is set, "a[].b" the default of b in
+# each element of list a
+NSX_DEFAULT_PARAMS = {
+    "*": {
+        "tags[].scope": "",
+    },
+    "lb-pools": {
+        "member_group.ip_revision_filter": "IPV4",
+        "members[].admin_state": "ENABLED",
+        "members[].backup_member": False,
+        "members[].weight": 1,
+        "snat_translation": {"type": "LBSnatAutoMap"},
+    },
+    "segments": {
+        "advanced_config": {
+            "hybrid": False,
+            "local_egress": False,
+            "connectivity": "ON",
+        },
+        "advanced_config.connectivity": "ON",
+        "advanced_config.hybrid": False,
+        "advanced_config.local_egress": False,
+    },
+    "static-routes": {
+        "next_hops[].admin_distance": 1,
+    },
+    "tier-1s": {
+        "route_advertisement_rules[].prefix_operator": "GE",
+    },
+}
+
+# Tag scope of hash of params applied by ansible when state_hash is enabled,
+# tag is "<hash>:<revision of nsx-t object once updated>"
+NSX_STATE_HASH_SCOPE = "ansible-state-hash"
+
+# Log levels of module messages, from least to most verbose
+NSX_LOG_LEVELS = ["error", "warning", "info", "debug"]
+
+# Messages logged by module, returned in 'debug' key when a log level is set with
+# log_level option or NSXT_POLICY_LOG_LEVEL environment variable
+NSX_LOG = dict(level=-1, messages=[])
+
+# Api sessions by credentials, kept while the python process runs (all items of
+# a module call, or all module calls of a task when run by nsxt_policy_local)
+NSX_SESSIONS = {}
+
+# Indexes of object paths by id and display name, by list url, kept like sessions
+NSX_PATH_INDEXES = {}
 
 
 def vmware_argument_spec():
@@ -29,6 +683,188 @@ def vmware_argument_spec():
     )
 
 
+def vmware_facts_argument_spec():
+    argument_spec = vmware_argument_spec()
+    argument_spec.update(
+        display_name=dict(type="str", required=False),
+        tags=dict(type="list", elements="dict", required=False),
+        name_regex=dict(type="str", required=False),
+        parent_path=dict(type="str", required=False),
+        query=dict(type="str", required=False),
+        output_format=dict(
+            type="str", required=False, default="list", choices=["list", "indexed"]
+        ),
+        index_key=dict(
+            type="str", required=False, default="id", choices=["id", "display_name"]
+        ),
+        dest=dict(type="path", required=False),
+        cacheable=dict(type="bool", required=False, default=False),
+        max_age=dict(type="int", required=False, default=0),
+        fact_name=dict(type="str", required=False),
+        since=dict(type="int", required=False),
+        known_ids=dict(type="list", elements="str", required=False),
+    )
+    return argument_spec
+
+
+def vmware_write_argument_spec():
+    argument_spec = vmware_argument_spec()
+    argument_spec.update(
+        wait=dict(type="bool", required=False, default=True),
+        items=dict(type="list", elements="dict", required=False),
+        batch_size=dict(type="int", required=False, default=0),
+        parallel_batches=dict(type="int", required=False, default=1),
+        state_hash=dict(type="bool", required=False, default=False),
+        full_compare=dict(type="bool", required=False, default=False),
+        log_level=dict(type="str", required=False, choices=NSX_LOG_LEVELS),
+    )
+    return argument_spec
+
+
+# Log message of level, message is only formatted with args if level is enabled
+def nsx_log(level, msg, *args):
+    if NSX_LOG_LEVELS.index(level) > NSX_LOG["level"]:
+        return
+    NSX_LOG["messages"].append(dict(level=level, msg=msg % args if args else msg))
+
+
+# Set log level of module and return logged messages in 'debug' key of module result
+def set_nsx_module_log(module):
+    # Module may run many times in the same process (nsxt_policy_local action)
+    NSX_LOG["level"] = -1
+    NSX_LOG["messages"] = []
+    level = module.params.get("log_level") or os.environ.get("NSXT_POLICY_LOG_LEVEL")
+    if level not in NSX_LOG_LEVELS:
+        return
+    NSX_LOG["level"] = NSX_LOG_LEVELS.index(level)
+
+    exit_json, fail_json = module.exit_json, module.fail_json
+
+    def exit_json_with_log(**kwargs):
+        kwargs.setdefault("debug", NSX_LOG["messages"])
+        exit_json(**kwargs)
+
+    def fail_json_with_log(**kwargs):
+        kwargs.setdefault("debug", NSX_LOG["messages"])
+        fail_json(**kwargs)
+
+    module.exit_json = exit_json_with_log
+    module.fail_json = fail_json_with_log
+
+
+# Validate params of one item (or resource) with module options and constraints,
+# return params with defaults of options
+def get_nsx_validated_params(
+    module, argument_spec, params, constraints, item, item_def="item"
+):
+    if HAS_ARGUMENT_SPEC_VALIDATOR:
+        result = ArgumentSpecValidator(argument_spec, **constraints).validate(params)
+        if result.error_messages:
+            module.fail_json(
+                msg="Invalid %s %s. Error [%s]"
+                % (item_def, item, result.error_messages[0])
+            )
+        return result.validated_parameters
+
+    for key, spec in argument_spec.items():
+        if params.get(key) is None and spec.get("default") is not None:
+            params[key] = copy.deepcopy(spec["default"])
+        if spec.get("required") and params.get(key) is None:
+            module.fail_json(
+                msg="missing required arguments in %s %s: %s" % (item_def, item, key)
+            )
+    from ansible.module_utils.common import validation
+
+    for constraint, terms in constraints.items():
+        try:
+            getattr(validation, "check_" + constraint)(terms, params)
+        except TypeError as err:
+            module.fail_json(
+                msg="Invalid %s %s. Error [%s]" % (item_def, item, to_native(err))
+            )
+    return params
+
+
+# Validate item params with module options and constraints, task params are used as
+# defaults for each item
+def get_nsx_item_params(module, item_argument_spec, item, item_constraints=None):
+    for key in item:
+        if key not in item_argument_spec:
+            module.fail_json(msg="Unsupported parameter %s in items" % (key))
+        if key in NSX_PARENT_PARAMS and item[key] != module.params[key]:
+            module.fail_json(msg="Parameter %s can't be set for one item" % (key))
+
+    item_params = dict(
+        (key, module.params[key])
+        for key in item_argument_spec
+        if module.params[key] is not None
+    )
+    item_params.update(item)
+    return get_nsx_validated_params(
+        module, item_argument_spec, item_params, item_constraints or {}, item
+    )
+
+
+# Check batch options of write modules
+def check_nsx_batch_params(module):
+    if module.params["batch_size"] < 0:
+        module.fail_json(msg="batch_size must be 0 (one call) or more")
+    if module.params["parallel_batches"] < 1:
+        module.fail_json(msg="parallel_batches must be 1 or more")
+
+
+# Create module for write modules, options required for one object are required
+# for each item when items is used
+def get_nsx_write_module(argument_spec, **kwargs):
+    write_argument_spec = vmware_write_argument_spec()
+    item_argument_spec = dict(
+        (key, copy.deepcopy(spec))
+        for key, spec in argument_spec.items()
+        if key not in write_argument_spec
+    )
+    required_params = [
+        key for key, spec in item_argument_spec.items() if spec.get("required")
+    ]
+    for key in required_params:
+        argument_spec[key] = dict(argument_spec[key], required=False)
+
+    module = AnsibleModule(argument_spec=argument_spec, **kwargs)
+    set_nsx_module_log(module)
+    check_nsx_batch_params(module)
+
+    if module.params["items"]:
+        item_constraints = dict(
+            (key, kwargs[key]) for key in NSX_ITEM_CONSTRAINTS if kwargs.get(key)
+        )
+        module.params["items"] = [
+            get_nsx_item_params(module, item_argument_spec, item, item_constraints)
+            for item in module.params["items"]
+        ]
+    else:
+        missing_params = [key for key in required_params if module.params[key] is None]
+        if missing_params:
+            module.fail_json(
+                msg="missing required arguments: %s" % (", ".join(missing_params))
+            )
+    return module
+
+
+# Return api session of user, its connections are reused by next api calls
+def get_nsx_session(url_username, url_password):
+    # requests is imported on first api call, module startup and params checks
+    # do not pay for it
+    import requests
+    from requests.auth import HTTPBasicAuth
+
+    key = (url_username, url_password)
+    if key not in NSX_SESSIONS:
+        requests.packages.urllib3.disable_warnings()
+        session = requests.session()
+        session.auth = HTTPBasicAuth(url_username, url_password)
+        NSX_SESSIONS[key] = session
+    return NSX_SESSIONS[key]
+
+
 def request(
     url,
     data=None,
@@ -46,24 +882,23 @@ def request(
     ignore_errors=False,
     port=443,
 ):
+    nsx_log("debug", "%s %s", method, url)
     try:
-        requests.packages.urllib3.disable_warnings()
-        s = requests.session()
-        s.auth = HTTPBasicAuth(url_username, url_password)
-        s.verify = validate_certs
-        s.headers.update(headers)
+        s = get_nsx_session(url_username, url_password)
+        # verify is given on each call, as session.verify is overridden by
+        # REQUESTS_CA_BUNDLE environment variable
         if method == "GET":
-            r = s.get(url)
+            r = s.get(url, headers=headers, verify=validate_certs)
         elif method == "PATCH":
-            r = s.patch(url, data=data)
+            r = s.patch(url, data=data, headers=headers, verify=validate_certs)
         elif method == "POST":
-            r = s.post(url, data=data)
+            r = s.post(url, data=data, headers=headers, verify=validate_certs)
         elif method == "PUT":
-            r = s.post(url, data=data)
+            r = s.post(url, data=data, headers=headers, verify=validate_certs)
         elif method == "DELETE":
-            r = s.delete(url)
+            r = s.delete(url, headers=headers, verify=validate_certs)
     except Exception as err:
-        print(err)
+        nsx_log("error", "%s %s failed: %s", method, url, err)
         r = err.fp
 
     try:
@@ -112,78 +947,214 @@ def request(
 #     return result
 
 
-def sort_key_func(item):
-    """ helper function used to sort list of dicts
+# Return identity key value as a string, containers as sorted json
+def get_canonical_identity_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list, tuple)):
+        return json.dumps(value, sort_keys=True)
+    return to_native(value)
+
 
-    :param item: dict
-    :return: sorted list of tuples (k, v)
-    """
-    pairs = []
-    for k, v in item.items():
-        pairs.append((k, v))
-    return sorted(pairs)
+# Return identity of list element with identity keys of the list, or None
+def get_canonical_identity(element, name):
+    if not isinstance(element, dict):
+        return None
+    for keys in NSX_LIST_IDENTITY_KEYS.get(name, []):
+        if any(element.get(key) is not None for key in keys):
+            return ":".join(
+                get_canonical_identity_value(element.get(key)) for key in keys
+            )
+    return None
 
 
-def recurse_compare_dict(d1, d2, is_different=False):
-    # Compare keys
-    d1_keys = set(d1.keys())
-    d2_keys = set(d2.keys())
-    d1_d2_key_diff = d1_keys ^ d2_keys
-    if bool(d1_d2_key_diff):
-        print("dict attributes are differents ! %s" % (d1_d2_key_diff))
-        is_different = True
-    # Compare recursively
-    else:
-        for k, v in sorted(d1.items()):
-            if isinstance(v, dict):
-                is_different = recurse_compare_dict(v, d2[k], is_different)
-            elif isinstance(v, list):
-                if len(v) != len(d2[k]):
-                    print(
-                        "list size differs, it's different ! d1 list : %s - d2 list : %s"
-                        % (v, d2[k])
-                    )
-                    is_different = True
-                else:
-                    index = 0
-
-                    if len(v) > 0 and isinstance(v[0], dict):
-                        v_keys = set(v[0].keys())
-                        ordered_v = sorted(
-                            v,
-                            key=lambda d: next(
-                                (i for (i, y) in enumerate(v_keys) if y in d),
-                                len(v_keys) + 1,
-                            ),
-                        )
-                        ordered_d2 = sorted(
-                            d2[k],
-                            key=lambda d: next(
-                                (i for (i, y) in enumerate(v_keys) if y in d),
-                                len(v_keys) + 1,
-                            ),
-                        )
-                        for e in ordered_v:
-                            if isinstance(e, dict):
-                                is_different = recurse_compare_dict(
-                                    e, ordered_d2[index], is_different
-                                )
-                            else:
-                                if str(e) != str(ordered_d2[index]):
-                                    print(
-                                        "value differs, it's different ! d1 value : %s - d2 value %s"
-                                        % (e, ordered_d2[index])
-                                    )
-                                    is_different = True
-                            index += 1
+# Return canonical hash of a nsx-t object or ansible params, equal for equal values.
+# None values of dicts are dropped, list elements are ordered by hash unless nsx-t
+# keeps their order. Scalars are compared as strings, like ansible params converted
+# by module options, and only containers are hashed.
+def get_canonical_hash(value, name=None):
+    if isinstance(value, dict):
+        content = "".join(
+            "%s=%s;" % (k, get_canonical_hash(value[k], k))
+            for k in sorted(to_native(k) for k in value)
+            if value[k] is not None
+        )
+        return hashlib.sha1(("{" + content).encode("utf-8")).hexdigest()
+    if isinstance(value, (list, tuple, set)):
+        hashes = [get_canonical_hash(v, name) for v in value]
+        if name in NSX_ORDERED_LISTS:
+            content = "(" + ",".join(hashes)
+        else:
+            content = "[" + ",".join(sorted(hashes))
+        return hashlib.sha1(content.encode("utf-8")).hexdigest()
+    return "=" + to_native(value)
+
+
+# Return matching key of list element: its identity, or its canonical hash
+def get_canonical_list_key(element, name):
+    identity = get_canonical_identity(element, name)
+    if identity is not None:
+        return ("identity", identity)
+    return ("hash", get_canonical_hash(element, name))
+
+
+# Return paths of differences between two lists. Ordered lists are compared by
+# position, other lists are matched by identity then by hash, and elements without
+# identity left are matched like dicts (attributes only set in nsx-t element are
+# ignored)
+def get_canonical_list_differences(value1, value2, name, path):
+    differences = []
+    if name in NSX_ORDERED_LISTS:
+        for index in range(max(len(value1), len(value2))):
+            index_path = "%s[%s]" % (path, index)
+            if index >= len(value1) or index >= len(value2):
+                differences.append(index_path)
+            else:
+                differences += get_canonical_differences(
+                    value1[index], value2[index], index_path, name
+                )
+        return differences
+
+    unmatched = {}
+    for element in value2:
+        unmatched.setdefault(get_canonical_list_key(element, name), []).append(
+            element
+        )
+    unmatched_indexes = []
+    for index, element in enumerate(value1):
+        key = get_canonical_list_key(element, name)
+        if not unmatched.get(key):
+            if key[0] == "identity":
+                differences.append("%s[%s]" % (path, key[1]))
             else:
-                if str(v) != str(d2[k]):
-                    print(
-                        "value differs, it's different ! d1 value : %s - d2 value %s"
-                        % (v, d2[k])
-                    )
-                    is_different = True
-    return is_different
+                unmatched_indexes.append(index)
+        elif key[0] == "identity":
+            differences += get_canonical_differences(
+                element, unmatched[key].pop(0), "%s[%s]" % (path, key[1]), name
+            )
+        else:
+            # Same hash, same element
+            unmatched[key].pop(0)
+    for index in unmatched_indexes:
+        for key, elements in unmatched.items():
+            position = next(
+                (
+                    position
+                    for position, element in enumerate(elements)
+                    if key[0] == "hash"
+                    and not get_canonical_differences(value1[index], element, "", name)
+                ),
+                None,
+            )
+            if position is not None:
+                elements.pop(position)
+                break
+        else:
+            differences.append("%s[%s]" % (path, index))
+    for key, elements in unmatched.items():
+        for element in elements:
+            differences.append(
+                "%s[%s]" % (path, key[1] if key[0] == "identity" else "")
+            )
+    return differences
+
+
+# Return paths of differences between params and nsx-t object, equal subtrees are
+# skipped without being walked
+def get_canonical_differences(value1, value2, path="", name=None):
+    if value1 == value2:
+        return []
+    if isinstance(value1, dict) and isinstance(value2, dict):
+        differences = []
+        # Attributes only set in nsx-t object are left unchanged by PATCH
+        for key in sorted(value1):
+            if value1[key] is None:
+                continue
+            key_path = "%s.%s" % (path, key) if path else key
+            if value2.get(key) is None:
+                differences.append(key_path)
+            else:
+                differences += get_canonical_differences(
+                    value1[key], value2[key], key_path, key
+                )
+        return differences
+    if isinstance(value1, (list, tuple)) and isinstance(value2, (list, tuple)):
+        return get_canonical_list_differences(value1, value2, name, path)
+    if isinstance(value1, (dict, list, tuple)) or isinstance(
+        value2, (dict, list, tuple)
+    ):
+        return [path]
+    if to_native(value1) != to_native(value2):
+        return [path]
+    return []
+
+
+# Set default value of a param, path is the list of keys of the param
+def set_nsx_default_param(params, path, default):
+    name = path[0]
+    if len(path) == 1:
+        if params.get(name) is None:
+            params[name] = copy.deepcopy(default)
+        return
+    if name.endswith("[]"):
+        targets = params.get(name[:-2]) or []
+    else:
+        targets = [params.get(name)]
+    for target in targets:
+        if isinstance(target, dict):
+            set_nsx_default_param(target, path[1:], default)
+
+
+# Set nsx-t defaults of api endpoint on params or nsx-t object
+def set_nsx_default_params(api_endpoint, params):
+    defaults = dict(NSX_DEFAULT_PARAMS["*"])
+    defaults.update(NSX_DEFAULT_PARAMS.get(api_endpoint, {}))
+    # Sorted so that defaults of an object are set before defaults of its attributes
+    for key in sorted(defaults):
+        set_nsx_default_param(params, key.split("."), defaults[key])
+    return params
+
+
+# Compare ansible params with nsx-t object, return paths of differences
+def compare_nsx_object(params, nsx_object):
+    return get_canonical_differences(params, nsx_object)
+
+
+# Remove state hash tag from params or nsx-t object
+def remove_nsx_state_hash_tag(params):
+    if params.get("tags"):
+        params["tags"] = [
+            tag for tag in params["tags"] if tag.get("scope") != NSX_STATE_HASH_SCOPE
+        ]
+    return params
+
+
+# Return hash of params applied by ansible
+def get_nsx_state_hash(params):
+    return get_canonical_hash(remove_nsx_state_hash_tag(dict(params)))
+
+
+# Check if state hash tag of nsx-t object matches hash of params, the object
+# must not be modified since (revision in tag is the current revision)
+def is_nsx_state_hash_current(nsx_object, state_hash):
+    for tag in nsx_object.get("tags") or []:
+        if tag.get("scope") == NSX_STATE_HASH_SCOPE:
+            return tag.get("tag") == "%s:%s" % (state_hash, nsx_object.get("_revision"))
+    return False
+
+
+# Add state hash tag to params, tags of nsx-t object are kept if params has no tags
+def set_nsx_state_hash_tag(params, nsx_object, state_hash, revision):
+    tags = params.get("tags")
+    if tags is None and nsx_object:
+        tags = nsx_object.get("tags")
+    params["tags"] = [
+        tag for tag in tags or [] if tag.get("scope") != NSX_STATE_HASH_SCOPE
+    ]
+    params["tags"].append(
+        dict(scope=NSX_STATE_HASH_SCOPE, tag="%s:%s" % (state_hash, revision))
+    )
+    return params
 
 
 # Remove vmware_nsxt module util parameters and return specific params for this nsx-t module
@@ -196,6 +1167,13 @@ def get_nsx_module_params(args=None, args_to_remove=None):
         "hostname",
         "validate_certs",
         "display_name",
+        "wait",
+        "items",
+        "batch_size",
+        "parallel_batches",
+        "state_hash",
+        "full_compare",
+        "log_level",
     ]
     args_to_remove += ansible_params_to_remove
     for key in args_to_remove:
@@ -228,7 +1206,7 @@ def remove_api_params(object, params_to_remove):
         "_protection",
         "_revision",
     ]
-    params_to_remove += api_params_to_remove
+    params_to_remove = list(params_to_remove) + api_params_to_remove
     for key in params_to_remove:
         int_object.pop(key, None)
     for key, value in int_object.copy().items():
@@ -237,6 +1215,54 @@ def remove_api_params(object, params_to_remove):
     return int_object
 
 
+# Return url of objects list page with cursor
+def get_nsx_page_url(url, cursor):
+    if not cursor:
+        return url
+    return "%s%scursor=%s" % (url, "&" if "?" in url else "?", quote(cursor))
+
+
+# Yield result pages of nsx-t objects list (or search) url, following page cursors
+def get_nsx_objects_pages(
+    module,
+    url,
+    mgr_username,
+    mgr_password,
+    validate_certs,
+    object_def,
+    ignore_not_found=False,
+):
+    headers = dict(Accept="application/json")
+    headers["Content-Type"] = "application/json"
+    cursor = None
+    while True:
+        try:
+            (rc, resp) = request(
+                url=get_nsx_page_url(url, cursor),
+                url_username=mgr_username,
+                url_password=mgr_password,
+                validate_certs=validate_certs,
+                ignore_errors=True,
+                headers=headers,
+            )
+        except Exception as err:
+            if (
+                ignore_not_found
+                and len(err.args) > 1
+                and isinstance(err.args[1], dict)
+                and err.args[1].get("httpStatus") == "NOT_FOUND"
+            ):
+                return
+            module.fail_json(
+                msg="Error getting  %s objects list. Error [%s]"
+                % (object_def, to_native(err))
+            )
+        yield resp
+        cursor = resp.get("cursor")
+        if not cursor or not resp.get("results"):
+            return
+
+
 # Get all nsx-t objects for current api endpoint
 def get_nsx_objects(
     module,
@@ -247,23 +1273,69 @@ def get_nsx_objects(
     validate_certs,
     object_def,
 ):
-    try:
-        headers = dict(Accept="application/json")
-        headers["Content-Type"] = "application/json"
-        (rc, resp) = request(
-            url=manager_url + "/" + api_endpoint,
-            url_username=mgr_username,
-            url_password=mgr_password,
-            validate_certs=validate_certs,
-            ignore_errors=True,
-            headers=headers,
-        )
-    except Exception as err:
-        module.fail_json(
-            msg="Error getting  %s objects list. Error [%s]"
-            % (object_def, to_native(err))
-        )
-    return resp
+    nsx_objects = None
+    for resp in get_nsx_objects_pages(
+        module=module,
+        url=manager_url + "/" + api_endpoint,
+        mgr_username=mgr_username,
+        mgr_password=mgr_password,
+        validate_certs=validate_certs,
+        object_def=object_def,
+    ):
+        if nsx_objects is None:
+            nsx_objects = resp
+        else:
+            nsx_objects["results"].extend(resp["results"])
+    nsx_objects.pop("cursor", None)
+    return nsx_objects
+
+
+# Read all objects of lists urls with up to parallel api calls at a time, return
+# objects by url and errors by url of failed lists
+def get_nsx_objects_lists(
+    mgr_username, mgr_password, validate_certs, urls, parallel=1
+):
+    headers = dict(Accept="application/json")
+    headers["Content-Type"] = "application/json"
+
+    def get_objects_list(url):
+        nsx_objects = []
+        cursor = None
+        try:
+            while True:
+                (rc, resp) = request(
+                    url=get_nsx_page_url(url, cursor),
+                    url_username=mgr_username,
+                    url_password=mgr_password,
+                    validate_certs=validate_certs,
+                    headers=headers,
+                )
+                nsx_objects.extend(resp.get("results") or [])
+                cursor = resp.get("cursor")
+                if not cursor or not resp.get("results"):
+                    return nsx_objects, None
+        except Exception as err:
+            return None, to_native(err)
+
+    if parallel > 1 and len(urls) > 1:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            lists = list(executor.map(get_objects_list, urls))
+    else:
+        lists = [get_objects_list(url) for url in urls]
+    nsx_objects = dict((url, objects) for url, (objects, error) in zip(urls, lists))
+    errors = dict((url, error) for url, (objects, error) in zip(urls, lists) if error)
+    return nsx_objects, errors
+
+
+# Return policy path of nsx-t object (eg: /infra/tier-1s/my-tier1)
+def get_intent_path(manager_url, api_endpoint, display_name):
+    return "%s/%s/%s" % (
+        manager_url.split("/policy/api/v1")[1],
+        api_endpoint,
+        display_name,
+    )
 
 
 # Get nsx-t object with display name
@@ -298,11 +1370,28 @@ def get_nsx_object(
 
 
 # Check if object must be updated
-def check_for_update(module, object, params, params_to_remove, protected_params):
+def check_for_update(
+    module,
+    object,
+    params,
+    params_to_remove,
+    protected_params,
+    api_endpoint=None,
+    state_hash=None,
+):
+    # Object is up to date if its state hash tag matches, unless full compare is asked
+    if state_hash:
+        state_hash_current = is_nsx_state_hash_current(object, state_hash)
+        if state_hash_current and not module.params.get("full_compare"):
+            nsx_log("info", "state hash tag of object is current: %s", state_hash)
+            return False
+
     clean_object = remove_api_params(object=object, params_to_remove=params_to_remove)
+    set_nsx_default_params(api_endpoint, clean_object)
+    remove_nsx_state_hash_tag(clean_object)
 
-    print("Debug - object returned by api : %s" % (clean_object))
-    print("Debug - object passed in params : %s" % (params))
+    nsx_log("debug", "object returned by api : %s", clean_object)
+    nsx_log("debug", "object passed in params : %s", params)
     for key in protected_params:
         if (
             (clean_object.__contains__(key) and not params.__contains__(key))
@@ -317,11 +1406,11 @@ def check_for_update(module, object, params, params_to_remove, protected_params)
                 msg="Parameter %s is protected. You cannot update this attribute."
                 % (key)
             )
-    if bool(params) or bool(clean_object):
-        result = recurse_compare_dict(params, clean_object)
-    else:
-        result = False
-    return result
+    differences = compare_nsx_object(params, clean_object)
+    if differences:
+        nsx_log("info", "differences between params and object : %s", differences)
+    # Missing or outdated state hash tag is recorded with an update
+    return bool(differences) or bool(state_hash and not state_hash_current)
 
 
 def create_or_update_nsx_object(
@@ -336,6 +1425,8 @@ def create_or_update_nsx_object(
     object_def,
     update_method,
     post_action=None,
+    wait=True,
+    revision=0,
 ):
     if module.check_mode:
         module.exit_json(
@@ -349,7 +1440,10 @@ def create_or_update_nsx_object(
         request_data = json.dumps(params)
         if update_method == "PATCH":
             (rc, resp) = request(
-                url=manager_url + "/" + api_endpoint + "/%s" % display_name,
+                url=manager_url
+                + "/"
+                + api_endpoint
+                + "/%s" % quote(display_name, safe=""),
                 headers=headers,
                 data=request_data,
                 method="PATCH",
@@ -374,6 +1468,15 @@ def create_or_update_nsx_object(
             % (object_def, display_name, to_native(err))
         )
 
+    if not wait:
+        module.exit_json(
+            changed=True,
+            object_name=display_name,
+            intent_paths=[get_intent_path(manager_url, api_endpoint, display_name)],
+            revision=revision,
+            message="%s with name %s submitted." % (object_def, display_name),
+        )
+
     time.sleep(5)
 
     module.exit_json(
@@ -392,6 +1495,7 @@ def delete_nsx_object(
     validate_certs,
     display_name,
     object_def,
+    wait=True,
 ):
     if module.check_mode:
         module.exit_json(changed=True, debug_out=str(id=display_name))
@@ -399,7 +1503,7 @@ def delete_nsx_object(
         headers = dict(Accept="application/json")
         headers["Content-Type"] = "application/json"
         (rc, resp) = request(
-            url=manager_url + "/" + api_endpoint + "/%s" % display_name,
+            url=manager_url + "/" + api_endpoint + "/%s" % quote(display_name, safe=""),
             method="DELETE",
             url_username=mgr_username,
             url_password=mgr_password,
@@ -412,6 +1516,15 @@ def delete_nsx_object(
             % (object_def, display_name, to_native(err))
         )
 
+    if not wait:
+        module.exit_json(
+            changed=True,
+            object_name=display_name,
+            intent_paths=[get_intent_path(manager_url, api_endpoint, display_name)],
+            revision=None,
+            message="%s with name %s deletion submitted." % (object_def, display_name),
+        )
+
     time.sleep(5)
     module.exit_json(
         changed=True,
@@ -420,49 +1533,560 @@ def delete_nsx_object(
     )
 
 
-def nsx_module_execution(
+# Return hierarchical api (H-API) url from module manager url
+def get_hapi_url(manager_url):
+    return manager_url.split("/policy/api/v1")[0] + "/policy/api/v1/infra"
+
+
+# Find H-API child node (eg: ChildTier1) wrapping object with given path
+def find_hapi_child(node, object_path):
+    for child in node.get("children", []):
+        for value in child.values():
+            if isinstance(value, dict) and value.get("path") == object_path:
+                return child
+            if isinstance(value, dict):
+                found = find_hapi_child(value, object_path)
+                if found:
+                    return found
+    return None
+
+
+# Keep only id and resource type of H-API child node and its children, marked for delete
+def mark_hapi_child_for_delete(child):
+    marked_child = dict(resource_type=child["resource_type"], marked_for_delete=True)
+    for key, value in child.items():
+        if isinstance(value, dict) and "resource_type" in value:
+            marked_object = dict(resource_type=value["resource_type"], id=value["id"])
+            if value.get("children"):
+                marked_object["children"] = [
+                    mark_hapi_child_for_delete(sub_child)
+                    for sub_child in value["children"]
+                ]
+            marked_child[key] = marked_object
+    return marked_child
+
+
+# Return H-API child for object with all its children, marked for delete
+def get_hapi_child_for_cascade_delete(
     module,
     manager_url,
-    api_endpoint,
+    mgr_username,
+    mgr_password,
+    validate_certs,
+    nsx_object,
+    display_name,
     object_def,
-    api_params_to_remove,
-    api_protected_params,
-    ansible_params_to_remove,
-    update_method="PATCH",
-    post_action=None,
 ):
+    hapi_url = get_hapi_url(manager_url)
+    headers = dict(Accept="application/json")
+    headers["Content-Type"] = "application/json"
+    try:
+        (rc, resp) = request(
+            url=hapi_url
+            + "?base_path=%s&filter=%s" % (nsx_object["path"], HAPI_ALL_TYPES_FILTER),
+            url_username=mgr_username,
+            url_password=mgr_password,
+            validate_certs=validate_certs,
+            headers=headers,
+        )
+    except Exception as err:
+        module.fail_json(
+            msg="Error getting children of %s with name %s. Error [%s]"
+            % (object_def, display_name, to_native(err))
+        )
+
+    child = find_hapi_child(resp, nsx_object["path"])
+    if child is None:
+        module.fail_json(
+            msg="Unable to find %s with name %s in hierarchical api response"
+            % (object_def, display_name)
+        )
+    return mark_hapi_child_for_delete(child)
+
+
+# Return H-API child for nsx-t object (eg: ChildTier1 with Tier1)
+def get_hapi_child(api_endpoint, params, object_id, marked_for_delete=False):
+    child_type = HAPI_CHILD_TYPES.get(api_endpoint) or params["resource_type"]
+    hapi_object = dict(params)
+    hapi_object["id"] = object_id
+    hapi_object.setdefault("resource_type", child_type)
+    child = {"resource_type": "Child%s" % child_type, child_type: hapi_object}
+    if marked_for_delete:
+        child["marked_for_delete"] = True
+    return child
+
+
+# Return H-API Infra body with children attached to parents of module manager url
+def get_hapi_infra(manager_url, children):
+    parent_path = manager_url.split("/policy/api/v1")[1].strip("/").split("/")[1:]
+    for index in reversed(range(0, len(parent_path), 2)):
+        children = [
+            dict(
+                resource_type="ChildResourceReference",
+                id=parent_path[index + 1],
+                target_type=HAPI_CHILD_TYPES[parent_path[index]],
+                children=children,
+            )
+        ]
+    return dict(resource_type="Infra", children=children)
+
+
+# Return H-API parent node of policy path (eg: ("tier-1s", "t1")), adding references
+# to missing parents
+def get_hapi_parent_node(hapi_nodes, parent_path):
+    if parent_path not in hapi_nodes:
+        node = dict(
+            resource_type="ChildResourceReference",
+            id=parent_path[-1],
+            target_type=HAPI_CHILD_TYPES[parent_path[-2]],
+            children=[],
+        )
+        parent = get_hapi_parent_node(hapi_nodes, parent_path[:-2])
+        parent.setdefault("children", []).append(node)
+        hapi_nodes[parent_path] = node
+    return hapi_nodes[parent_path]
+
+
+# Return H-API Infra body with children of many parents, list of (manager url, api
+# endpoint, child). Children of an object created or updated by the same call are
+# attached to it, so parents must come first
+def get_merged_hapi_infra(hapi_children):
+    infra = dict(resource_type="Infra", children=[])
+    hapi_nodes = {(): infra}
+    for manager_url, api_endpoint, child in hapi_children:
+        parent_path = tuple(
+            manager_url.split("/policy/api/v1")[1].strip("/").split("/")[1:]
+        )
+        parent_node = get_hapi_parent_node(hapi_nodes, parent_path)
+        parent_node.setdefault("children", []).append(child)
+        hapi_object = child.get(child["resource_type"][len("Child") :])
+        if hapi_object and not child.get("marked_for_delete"):
+            hapi_nodes[parent_path + (api_endpoint, hapi_object["id"])] = hapi_object
+    return infra
+
+
+# Return dependency level of H-API children, list of (manager url, api endpoint,
+# child): 0 for children without parent created or updated by another child, or
+# level of their parent + 1
+def get_hapi_children_levels(hapi_children):
+    levels = []
+    object_levels = {}
+    for manager_url, api_endpoint, child in hapi_children:
+        parent_path = tuple(
+            manager_url.split("/policy/api/v1")[1].strip("/").split("/")[1:]
+        )
+        level = max(
+            [
+                object_levels[parent_path[:index]] + 1
+                for index in range(2, len(parent_path) + 1, 2)
+                if parent_path[:index] in object_levels
+            ]
+            or [0]
+        )
+        levels.append(level)
+        hapi_object = child.get(child["resource_type"][len("Child") :])
+        if hapi_object and not child.get("marked_for_delete"):
+            object_levels[parent_path + (api_endpoint, hapi_object["id"])] = level
+    return levels
+
+
+# Create, update or delete many nsx-t objects with hierarchical api calls of
+# batch_size children (one call if 0), sending up to parallel calls at once.
+# hapi_children is a list of (manager url, api endpoint, child).
+# Parallel calls only send children of the same dependency level, parents are
+# applied by calls of previous levels.
+# Return error of the call of each child, None if applied
+def patch_hapi_infra_batches(
+    mgr_username,
+    mgr_password,
+    validate_certs,
+    hapi_children,
+    batch_size=0,
+    parallel=1,
+):
+    batch_size = batch_size or len(hapi_children)
+    if parallel > 1:
+        levels = get_hapi_children_levels(hapi_children)
+    else:
+        # Calls are sent in order, parents come first
+        levels = [0] * len(hapi_children)
+    batches_by_level = []
+    for level in range(max(levels) + 1 if levels else 0):
+        indexes = [index for index, value in enumerate(levels) if value == level]
+        batches_by_level.append(
+            [
+                indexes[index : index + batch_size]
+                for index in range(0, len(indexes), batch_size)
+            ]
+        )
 
-    nsx_module_params = get_nsx_module_params(
-        module.params.copy(), ansible_params_to_remove
-    )
+    def patch_batch(batch):
+        batch = [hapi_children[index] for index in batch]
+        try:
+            headers = dict(Accept="application/json")
+            headers["Content-Type"] = "application/json"
+            request(
+                url=get_hapi_url(batch[0][0]),
+                headers=headers,
+                data=json.dumps(get_merged_hapi_infra(batch)),
+                method="PATCH",
+                url_username=mgr_username,
+                url_password=mgr_password,
+                validate_certs=validate_certs,
+            )
+        except Exception as err:
+            return to_native(err)
+        return None
 
-    state = module.params["state"]
-    mgr_hostname = module.params["hostname"]
-    mgr_username = module.params["username"]
-    mgr_password = module.params["password"]
-    validate_certs = module.params["validate_certs"]
-    display_name = module.params["display_name"]
+    errors = [None] * len(hapi_children)
+    for batches in batches_by_level:
+        if parallel > 1 and len(batches) > 1:
+            from concurrent.futures import ThreadPoolExecutor
 
-    # Search for nsx object
-    nsx_object = get_nsx_object(
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                batch_errors = list(executor.map(patch_batch, batches))
+        else:
+            batch_errors = [patch_batch(batch) for batch in batches]
+        for batch, error in zip(batches, batch_errors):
+            for index in batch:
+                errors[index] = error
+    return errors
+
+
+# Delete nsx-t object and all its children with one hierarchical api call
+def cascade_delete_nsx_object(
+    module,
+    manager_url,
+    mgr_username,
+    mgr_password,
+    validate_certs,
+    nsx_object,
+    display_name,
+    object_def,
+    wait=True,
+):
+    if module.check_mode:
+        module.exit_json(changed=True, id=display_name)
+
+    child = get_hapi_child_for_cascade_delete(
         module=module,
         manager_url=manager_url,
-        api_endpoint=api_endpoint,
         mgr_username=mgr_username,
         mgr_password=mgr_password,
         validate_certs=validate_certs,
+        nsx_object=nsx_object,
         display_name=display_name,
         object_def=object_def,
     )
 
-    if nsx_object:
-        exits_object = True
-    else:
-        exits_object = False
-    # Present state
-    if state == "present":
-
-        # If object already exists, check for update
+    hapi_url = get_hapi_url(manager_url)
+    headers = dict(Accept="application/json")
+    headers["Content-Type"] = "application/json"
+    request_data = json.dumps(dict(resource_type="Infra", children=[child]))
+    try:
+        (rc, resp) = request(
+            url=hapi_url,
+            headers=headers,
+            data=request_data,
+            method="PATCH",
+            url_username=mgr_username,
+            url_password=mgr_password,
+            validate_certs=validate_certs,
+        )
+    except Exception as err:
+        module.fail_json(
+            msg="Failed to delete %s with name %s and its children. Error[%s]."
+            % (object_def, display_name, to_native(err))
+        )
+
+    if not wait:
+        module.exit_json(
+            changed=True,
+            object_name=display_name,
+            intent_paths=[nsx_object["path"]],
+            revision=None,
+            message="%s with name %s and its children deletion submitted."
+            % (object_def, display_name),
+        )
+
+    time.sleep(5)
+    module.exit_json(
+        changed=True,
+        object_name=display_name,
+        message="%s with name %s and its children deleted."
+        % (object_def, display_name),
+    )
+
+
+# Index nsx-t objects by id and display name, display name wins like in get_nsx_object
+def get_nsx_objects_index(nsx_objects):
+    nsx_objects_index = {}
+    for nsx_object in nsx_objects:
+        nsx_objects_index.setdefault(nsx_object.get("id"), nsx_object)
+    for nsx_object in nsx_objects:
+        nsx_objects_index[nsx_object.get("display_name")] = nsx_object
+    return nsx_objects_index
+
+
+# Compare item with its nsx-t object (None if missing) and return item result with
+# H-API child to apply (None when nothing to change)
+def get_nsx_item_change(
+    module,
+    manager_url,
+    api_endpoint,
+    object_def,
+    api_params_to_remove,
+    api_protected_params,
+    ansible_params_to_remove,
+    item_params,
+    nsx_object,
+):
+    display_name = item_params["display_name"]
+    state = item_params["state"]
+    nsx_module_params = set_nsx_default_params(
+        api_endpoint,
+        get_nsx_module_params(item_params.copy(), list(ansible_params_to_remove)),
+    )
+    result = dict(display_name=display_name, changed=False)
+    hapi_child = None
+    state_hash = None
+    if module.params["state_hash"]:
+        state_hash = get_nsx_state_hash(nsx_module_params)
+
+    if state == "present":
+        if nsx_object:
+            object_id = nsx_object["id"]
+            intent_path = nsx_object["path"]
+            revision = nsx_object["_revision"] + 1
+            to_update = check_for_update(
+                module=module,
+                object=dict(nsx_object),
+                params=nsx_module_params,
+                params_to_remove=list(api_params_to_remove),
+                protected_params=api_protected_params,
+                api_endpoint=api_endpoint,
+                state_hash=state_hash,
+            )
+        else:
+            object_id = display_name
+            intent_path = get_intent_path(manager_url, api_endpoint, display_name)
+            revision = 0
+            to_update = True
+
+        if to_update:
+            if state_hash:
+                set_nsx_state_hash_tag(
+                    nsx_module_params, nsx_object, state_hash, revision
+                )
+            hapi_child = get_hapi_child(api_endpoint, nsx_module_params, object_id)
+            result.update(
+                changed=True,
+                msg="%s with name %s created or updated." % (object_def, display_name),
+            )
+        else:
+            result["msg"] = "%s with display name %s is up to date" % (
+                object_def,
+                display_name,
+            )
+
+    elif state == "absent":
+        intent_path = nsx_object["path"] if nsx_object else None
+        revision = None
+        if nsx_object and item_params.get("cascade"):
+            hapi_child = get_hapi_child_for_cascade_delete(
+                module=module,
+                manager_url=manager_url,
+                mgr_username=module.params["username"],
+                mgr_password=module.params["password"],
+                validate_certs=module.params["validate_certs"],
+                nsx_object=nsx_object,
+                display_name=display_name,
+                object_def=object_def,
+            )
+        elif nsx_object:
+            hapi_child = get_hapi_child(
+                api_endpoint,
+                dict(resource_type=nsx_object["resource_type"]),
+                nsx_object["id"],
+                marked_for_delete=True,
+            )
+        if nsx_object:
+            result.update(
+                changed=True,
+                msg="%s with name %s deleted." % (object_def, display_name),
+            )
+        else:
+            result["msg"] = "No %s exist with display name %s" % (
+                object_def,
+                display_name,
+            )
+
+    if result["changed"] and not module.params["wait"]:
+        result.update(intent_paths=[intent_path], revision=revision)
+    return result, hapi_child
+
+
+# Apply H-API changes, list of (item result, object_def, manager_url, api_endpoint,
+# H-API child), with batch_size and parallel_batches module options. Items of failed
+# calls are reported as failed and module fails with results of all items
+def apply_nsx_item_changes(module, changes, results):
+    if not changes or module.check_mode:
+        return
+
+    errors = patch_hapi_infra_batches(
+        mgr_username=module.params["username"],
+        mgr_password=module.params["password"],
+        validate_certs=module.params["validate_certs"],
+        hapi_children=[change[2:] for change in changes],
+        batch_size=module.params["batch_size"],
+        parallel=module.params["parallel_batches"],
+    )
+    # Items of failed calls are not changed, other calls were applied
+    for (result, object_def, manager_url, api_endpoint, hapi_child), error in zip(
+        changes, errors
+    ):
+        if error:
+            result.pop("intent_paths", None)
+            result.pop("revision", None)
+            result.update(
+                changed=False,
+                failed=True,
+                msg="Failed to apply %s with name %s. Error[%s]."
+                % (object_def, result["display_name"], error),
+            )
+    failed_errors = [error for error in errors if error]
+    if failed_errors:
+        module.fail_json(
+            changed=len(failed_errors) < len(errors),
+            results=results,
+            msg="Failed to apply %s items on %s. Error[%s]."
+            % (len(failed_errors), len(results), failed_errors[0]),
+        )
+    if module.params["wait"]:
+        time.sleep(5)
+
+
+# Create, update or delete many nsx-t objects of module with one listing and
+# hierarchical api calls
+def nsx_module_items_execution(
+    module,
+    manager_url,
+    api_endpoint,
+    object_def,
+    api_params_to_remove,
+    api_protected_params,
+    ansible_params_to_remove,
+):
+    nsx_objects = get_nsx_objects(
+        module=module,
+        manager_url=manager_url,
+        api_endpoint=api_endpoint,
+        mgr_username=module.params["username"],
+        mgr_password=module.params["password"],
+        validate_certs=module.params["validate_certs"],
+        object_def=object_def,
+    )
+    nsx_objects_index = get_nsx_objects_index(nsx_objects["results"])
+
+    changes = []
+    results = []
+    display_names = set()
+    for item in module.params["items"]:
+        item_params = dict(module.params, **item)
+        display_name = item_params["display_name"]
+        if display_name in display_names:
+            module.fail_json(
+                msg="%s %s is defined twice in items" % (object_def, display_name)
+            )
+        display_names.add(display_name)
+
+        result, hapi_child = get_nsx_item_change(
+            module=module,
+            manager_url=manager_url,
+            api_endpoint=api_endpoint,
+            object_def=object_def,
+            api_params_to_remove=api_params_to_remove,
+            api_protected_params=api_protected_params,
+            ansible_params_to_remove=ansible_params_to_remove,
+            item_params=item_params,
+            nsx_object=nsx_objects_index.get(display_name),
+        )
+        if hapi_child:
+            changes.append((result, object_def, manager_url, api_endpoint, hapi_child))
+        results.append(result)
+
+    apply_nsx_item_changes(module, changes, results)
+
+    module.exit_json(
+        changed=bool(changes),
+        results=results,
+        msg="%s %s items changed on %s" % (len(changes), object_def, len(results)),
+    )
+
+
+def nsx_module_execution(
+    module,
+    manager_url,
+    api_endpoint,
+    object_def,
+    api_params_to_remove,
+    api_protected_params,
+    ansible_params_to_remove,
+    update_method="PATCH",
+    post_action=None,
+    cascade=False,
+):
+
+    if module.params["items"]:
+        nsx_module_items_execution(
+            module=module,
+            manager_url=manager_url,
+            api_endpoint=api_endpoint,
+            object_def=object_def,
+            api_params_to_remove=api_params_to_remove,
+            api_protected_params=api_protected_params,
+            ansible_params_to_remove=ansible_params_to_remove,
+        )
+
+    nsx_module_params = set_nsx_default_params(
+        api_endpoint,
+        get_nsx_module_params(module.params.copy(), ansible_params_to_remove),
+    )
+
+    state = module.params["state"]
+    mgr_hostname = module.params["hostname"]
+    mgr_username = module.params["username"]
+    mgr_password = module.params["password"]
+    validate_certs = module.params["validate_certs"]
+    display_name = module.params["display_name"]
+    wait = module.params["wait"]
+    state_hash = None
+    if module.params["state_hash"]:
+        state_hash = get_nsx_state_hash(nsx_module_params)
+
+    # Search for nsx object
+    nsx_object = get_nsx_object(
+        module=module,
+        manager_url=manager_url,
+        api_endpoint=api_endpoint,
+        mgr_username=mgr_username,
+        mgr_password=mgr_password,
+        validate_certs=validate_certs,
+        display_name=display_name,
+        object_def=object_def,
+    )
+
+    if nsx_object:
+        exits_object = True
+        # Revision expected once the update is applied by nsx-t
+        revision = nsx_object["_revision"] + 1
+    else:
+        exits_object = False
+        revision = 0
+    # Present state
+    if state == "present":
+
+        # If object already exists, check for update
         if exits_object:
             to_update = check_for_update(
                 module=module,
@@ -470,10 +2094,16 @@ def nsx_module_execution(
                 params=nsx_module_params,
                 params_to_remove=api_params_to_remove,
                 protected_params=api_protected_params,
+                api_endpoint=api_endpoint,
+                state_hash=state_hash,
             )
 
         # Create or update NSX object
         if not exits_object or to_update:
+            if state_hash:
+                set_nsx_state_hash_tag(
+                    nsx_module_params, nsx_object, state_hash, revision
+                )
             create_or_update_nsx_object(
                 module=module,
                 manager_url=manager_url,
@@ -486,6 +2116,8 @@ def nsx_module_execution(
                 object_def=object_def,
                 update_method=update_method,
                 post_action=post_action,
+                wait=wait,
+                revision=revision,
             )
         else:
             module.exit_json(
@@ -496,7 +2128,19 @@ def nsx_module_execution(
 
     # Absent state
     if state == "absent":
-        if nsx_object:
+        if nsx_object and cascade:
+            cascade_delete_nsx_object(
+                module=module,
+                manager_url=manager_url,
+                mgr_username=mgr_username,
+                mgr_password=mgr_password,
+                validate_certs=validate_certs,
+                nsx_object=nsx_object,
+                display_name=display_name,
+                object_def=object_def,
+                wait=wait,
+            )
+        elif nsx_object:
             delete_nsx_object(
                 module=module,
                 manager_url=manager_url,
@@ -506,6 +2150,7 @@ def nsx_module_execution(
                 validate_certs=validate_certs,
                 display_name=display_name,
                 object_def=object_def,
+                wait=wait,
             )
         else:
             module.exit_json(
@@ -514,7 +2159,540 @@ def nsx_module_execution(
             )
 
 
+# Return registry settings of resource, with variant of parent option set in params
+def get_nsx_resource(resource_name, params):
+    resource = dict(NSX_RESOURCES[resource_name])
+    for option, variant in resource.pop("variants", {}).items():
+        if params.get(option):
+            resource.update(variant)
+            break
+    return resource
+
+
+# Return manager url of resource parent (eg: .../infra/tier-1s/my-tier1) from params
+def get_nsx_resource_url(hostname, resource, params):
+    manager_url = "https://{}/policy/api/v1/infra".format(hostname)
+    for parent in resource["parents"]:
+        options = parent if isinstance(parent, list) else [parent]
+        option = next((option for option in options if params.get(option)), None)
+        if option is None:
+            raise ValueError("Missing parameter %s" % (" or ".join(options)))
+        manager_url += "/%s/%s" % (NSX_PARENT_ENDPOINTS[option], params[option])
+    return manager_url
+
+
+# Return options of registry resource, without options shared by write modules
+def get_nsx_resource_argument_spec(resource_name):
+    return copy.deepcopy(NSX_RESOURCES[resource_name]["argument_spec"])
+
+
+# Create write module of registry resource with its options and constraints
+def get_nsx_resource_write_module(resource_name):
+    resource = NSX_RESOURCES[resource_name]
+    argument_spec = vmware_write_argument_spec()
+    argument_spec.update(get_nsx_resource_argument_spec(resource_name))
+    constraints = dict(
+        (key, resource[key]) for key in NSX_ITEM_CONSTRAINTS if key in resource
+    )
+    return get_nsx_write_module(
+        argument_spec=argument_spec, supports_check_mode=True, **constraints
+    )
+
+
+# Run write module of registry resource (eg: segments for nsxt_policy_segments)
+def nsx_resource_module_execution(module, resource_name):
+    if module.params["items"]:
+        for item in module.params["items"]:
+            if item.get("state") != "absent":
+                resolve_nsx_references(
+                    module, resource_name, item, module.params.get("domain")
+                )
+    elif module.params.get("state") != "absent":
+        resolve_nsx_references(module, resource_name, module.params)
+    resource = get_nsx_resource(resource_name, module.params)
+    try:
+        manager_url = get_nsx_resource_url(
+            module.params["hostname"], resource, module.params
+        )
+    except ValueError as err:
+        module.fail_json(msg=to_native(err))
+    if resource.get("resource_type"):
+        module.params["resource_type"] = resource["resource_type"]
+
+    nsx_module_execution(
+        module=module,
+        manager_url=manager_url,
+        api_endpoint=resource["api_endpoint"],
+        object_def=resource["object_def"],
+        api_params_to_remove=resource["api_params_to_remove"],
+        api_protected_params=resource["api_protected_params"],
+        ansible_params_to_remove=list(resource["ansible_params_to_remove"]),
+        cascade=module.params.get("cascade", False),
+    )
+
+
+# Return index of object paths by id and display name of policy list path, read once
+# by python process unless refresh is true
+def get_nsx_path_index(module, list_path, refresh=False):
+    url = "https://%s/policy/api/v1%s" % (module.params["hostname"], list_path)
+    if refresh or url not in NSX_PATH_INDEXES:
+        index = dict(ids={}, names={})
+        for resp in get_nsx_objects_pages(
+            module=module,
+            url=url + "?included_fields=id,display_name,path",
+            mgr_username=module.params["username"],
+            mgr_password=module.params["password"],
+            validate_certs=module.params["validate_certs"],
+            object_def=list_path,
+        ):
+            for nsx_object in resp.get("results") or []:
+                index["ids"][nsx_object["id"]] = nsx_object["path"]
+                index["names"].setdefault(nsx_object.get("display_name"), []).append(
+                    nsx_object["path"]
+                )
+        NSX_PATH_INDEXES[url] = index
+    return NSX_PATH_INDEXES[url]
+
+
+# Return path of object referenced by display name or id, paths and ANY are kept.
+# path_params are domain, site and enforcement point of list paths
+def get_nsx_reference_path(module, value, object_types, path_params):
+    if not isinstance(value, string_types) or value.startswith("/"):
+        return value
+    if value.upper() == "ANY":
+        return value
+    for refresh in [False, True]:
+        paths = []
+        for object_type in object_types:
+            index = get_nsx_path_index(
+                module, NSX_PATH_TYPES[object_type].format(**path_params), refresh
+            )
+            if value in index["ids"]:
+                paths.append(index["ids"][value])
+            else:
+                paths.extend(index["names"].get(value, []))
+        if paths:
+            break
+    if not paths:
+        module.fail_json(
+            msg="No %s found with name %s" % (" or ".join(object_types), value)
+        )
+    if len(paths) > 1:
+        module.fail_json(
+            msg="Name %s is not unique, use one of paths %s" % (value, ", ".join(paths))
+        )
+    return paths[0]
+
+
+# Replace display names by paths in params of resource referencing other objects,
+# params are validated before (list elements are dicts)
+def resolve_nsx_references(module, resource_name, params, domain=None):
+    path_params = dict(
+        domain=params.get("domain") or domain or "default",
+        site=params.get("site") or "default",
+        enforcement_point=params.get("enforcement_point") or "default",
+    )
+    for reference, object_types in NSX_PATH_REFERENCES.get(resource_name, {}).items():
+        list_param, _, param = reference.rpartition(".")
+        if list_param:
+            if not isinstance(params.get(list_param), list):
+                continue
+            params[list_param] = [
+                dict(element) if isinstance(element, dict) else element
+                for element in params[list_param]
+            ]
+            targets = [
+                element for element in params[list_param] if isinstance(element, dict)
+            ]
+        else:
+            targets = [params]
+        for target in targets:
+            if target.get(param) is None:
+                continue
+            if isinstance(target[param], list):
+                target[param] = [
+                    get_nsx_reference_path(module, value, object_types, path_params)
+                    for value in target[param]
+                ]
+            else:
+                target[param] = get_nsx_reference_path(
+                    module, target[param], object_types, path_params
+                )
+
+
+# Return nsx-t objects of api endpoint, none when parent doesn't exist (yet)
+def get_nsx_resource_objects(module, manager_url, api_endpoint, object_def):
+    return [
+        nsx_object
+        for resp in get_nsx_objects_pages(
+            module=module,
+            url=manager_url + "/" + api_endpoint,
+            mgr_username=module.params["username"],
+            mgr_password=module.params["password"],
+            validate_certs=module.params["validate_certs"],
+            object_def=object_def,
+            ignore_not_found=True,
+        )
+        for nsx_object in resp.get("results") or []
+    ]
+
+
+# Validate resource of nsxt_policy_resource with options of its write module.
+# Options of nsxt_policy_resource are defaults of resources, a parent set by the
+# resource replaces its alternatives (eg: tier1 of resource and tier0 of module)
+def get_nsx_resource_params(module, resource_name, item):
+    resource = NSX_RESOURCES[resource_name]
+    argument_spec = get_nsx_resource_argument_spec(resource_name)
+    for key in item:
+        if key != "resource" and key not in argument_spec:
+            module.fail_json(
+                msg="Unsupported parameter %s in resource %s" % (key, resource_name)
+            )
+
+    params = dict(
+        (key, module.params[key])
+        for key in argument_spec
+        if module.params.get(key) is not None
+    )
+    for parent in resource["parents"]:
+        options = parent if isinstance(parent, list) else [parent]
+        if any(item.get(option) is not None for option in options):
+            for option in options:
+                params.pop(option, None)
+    params.update(
+        (key, value)
+        for key, value in item.items()
+        if key != "resource" and value is not None
+    )
+    constraints = dict(
+        (key, resource[key]) for key in NSX_ITEM_CONSTRAINTS if key in resource
+    )
+    return get_nsx_validated_params(
+        module, argument_spec, params, constraints, item, "resource"
+    )
+
+
+# Create, update or delete objects of many registry resources ('resources' option of
+# nsxt_policy_resource) with one listing by parent and api endpoint, and hierarchical
+# api calls shared by all resources
+def nsx_resources_execution(module):
+    check_nsx_batch_params(module)
+    common_params = dict(
+        (key, value) for key, value in module.params.items() if key != "resources"
+    )
+    # Options of nsxt_policy_resource which aren't api params of any resource
+    resource_params_to_remove = ["resource", "cascade"] + NSX_PARENT_PARAMS
+
+    nsx_objects_indexes = {}
+    changes = []
+    results = []
+    resource_keys = set()
+    for item in module.params["resources"]:
+        resource_name = item.get("resource")
+        if resource_name not in NSX_RESOURCES:
+            module.fail_json(
+                msg="Unsupported resource %s in resources, resource must be one of %s"
+                % (resource_name, ", ".join(sorted(NSX_RESOURCES)))
+            )
+        item_params = dict(common_params)
+        item_params.update(get_nsx_resource_params(module, resource_name, item))
+        if item_params.get("state") != "absent":
+            resolve_nsx_references(module, resource_name, item_params)
+
+        resource = get_nsx_resource(resource_name, item_params)
+        try:
+            manager_url = get_nsx_resource_url(
+                module.params["hostname"], resource, item_params
+            )
+        except ValueError as err:
+            module.fail_json(
+                msg="Invalid resource %s. Error [%s]" % (item, to_native(err))
+            )
+        if resource.get("resource_type"):
+            item_params["resource_type"] = resource["resource_type"]
+
+        api_endpoint = resource["api_endpoint"]
+        display_name = item_params["display_name"]
+        if (manager_url, api_endpoint, display_name) in resource_keys:
+            module.fail_json(
+                msg="%s %s is defined twice in resources"
+                % (resource["object_def"], display_name)
+            )
+        resource_keys.add((manager_url, api_endpoint, display_name))
+
+        if (manager_url, api_endpoint) not in nsx_objects_indexes:
+            nsx_objects_indexes[(manager_url, api_endpoint)] = get_nsx_objects_index(
+                get_nsx_resource_objects(
+                    module, manager_url, api_endpoint, resource["object_def"]
+                )
+            )
+        nsx_objects_index = nsx_objects_indexes[(manager_url, api_endpoint)]
+
+        result, hapi_child = get_nsx_item_change(
+            module=module,
+            manager_url=manager_url,
+            api_endpoint=api_endpoint,
+            object_def=resource["object_def"],
+            api_params_to_remove=resource["api_params_to_remove"],
+            api_protected_params=resource["api_protected_params"],
+            ansible_params_to_remove=resource["ansible_params_to_remove"]
+            + resource_params_to_remove,
+            item_params=item_params,
+            nsx_object=nsx_objects_index.get(display_name),
+        )
+        result["resource"] = resource_name
+        if hapi_child:
+            changes.append(
+                (result, resource["object_def"], manager_url, api_endpoint, hapi_child)
+            )
+        results.append(result)
+
+    apply_nsx_item_changes(module, changes, results)
+
+    module.exit_json(
+        changed=bool(changes),
+        results=results,
+        msg="%s resources changed on %s" % (len(changes), len(results)),
+    )
+
+
+# Escape value for search api query, a trailing wildcard is kept
+def escape_nsx_search_value(value):
+    value = to_native(value)
+    wildcard = "*" if value.endswith("*") else ""
+    return (
+        "".join(
+            "\\" + char if char in NSX_SEARCH_SPECIAL_CHARS else char
+            for char in value[: len(value) - len(wildcard)]
+        )
+        + wildcard
+    )
+
+
+# Return search api query for objects of facts module filters, None if objects of
+# api endpoint can't be searched
+def get_nsx_search_query(module, manager_url, api_endpoint):
+    resource_types = NSX_SEARCH_RESOURCE_TYPES.get(api_endpoint)
+    if resource_types is None and api_endpoint in HAPI_CHILD_TYPES:
+        resource_types = [HAPI_CHILD_TYPES[api_endpoint]]
+    if not resource_types:
+        return None
+
+    if len(resource_types) == 1:
+        clauses = ["resource_type:%s" % resource_types[0]]
+    else:
+        clauses = ["resource_type:(%s)" % " OR ".join(resource_types)]
+    parent_path = (
+        module.params.get("parent_path") or manager_url.split("/policy/api/v1")[1]
+    )
+    clauses.append("parent_path:%s" % escape_nsx_search_value(parent_path))
+    for tag in module.params.get("tags") or []:
+        for key in ["scope", "tag"]:
+            if tag.get(key) is not None:
+                clauses.append("tags.%s:%s" % (key, escape_nsx_search_value(tag[key])))
+    if module.params.get("since"):
+        clauses.append("_last_modified_time:[%d TO *]" % (module.params["since"]))
+    if module.params.get("query"):
+        clauses.append("(%s)" % module.params["query"])
+    return " AND ".join(clauses)
+
+
+# Return search api url of query
+def get_nsx_search_url(manager_url, query):
+    return "%s/policy/api/v1/search/query?query=%s" % (
+        manager_url.split("/policy/api/v1")[0],
+        quote(query),
+    )
+
+
+# Check if nsx-t object has all tags, tags without scope (or tag) match any scope
+def has_nsx_tags(nsx_object, tags):
+    object_tags = nsx_object.get("tags") or []
+    for tag in tags:
+        if not any(
+            all(
+                object_tag.get(key) == tag[key]
+                for key in ["scope", "tag"]
+                if tag.get(key) is not None
+            )
+            for object_tag in object_tags
+        ):
+            return False
+    return True
+
+
+# Return objects matching filters of facts module. Search api filters are checked
+# again, as tag scope and tag may be found on different tags of an object
+def filter_nsx_objects(module, nsx_objects):
+    tags = module.params.get("tags") or []
+    name_regex = module.params.get("name_regex")
+    parent_path = module.params.get("parent_path")
+    since = module.params.get("since")
+    if name_regex:
+        try:
+            name_pattern = re.compile(name_regex)
+        except re.error as err:
+            module.fail_json(
+                msg="Invalid name_regex %s. Error [%s]" % (name_regex, to_native(err))
+            )
+
+    filtered_objects = []
+    for nsx_object in nsx_objects:
+        if name_regex and not name_pattern.search(nsx_object.get("display_name") or ""):
+            continue
+        if parent_path and not fnmatch.fnmatchcase(
+            nsx_object.get("parent_path") or "", parent_path
+        ):
+            continue
+        if tags and not has_nsx_tags(nsx_object, tags):
+            continue
+        if since is not None and nsx_object.get("_last_modified_time", 0) < since:
+            continue
+        filtered_objects.append(nsx_object)
+    return filtered_objects
+
+
+# Yield pages of objects of facts module, from search api when it has filters the
+# search api supports (tags, parent_path, query, since), from objects listing otherwise
+def get_nsx_facts_pages(module, manager_url, api_endpoint, object_def):
+    query = None
+    if any(
+        module.params.get(key) for key in ["tags", "parent_path", "query", "since"]
+    ):
+        query = get_nsx_search_query(module, manager_url, api_endpoint)
+        if query is None and module.params.get("query"):
+            module.fail_json(msg="query can't be used with %s objects" % (object_def))
+
+    if query:
+        nsx_log("info", "search query: %s", query)
+        url = get_nsx_search_url(manager_url, query)
+    else:
+        url = manager_url + "/" + api_endpoint
+    for resp in get_nsx_objects_pages(
+        module=module,
+        url=url,
+        mgr_username=module.params["username"],
+        mgr_password=module.params["password"],
+        validate_certs=module.params["validate_certs"],
+        object_def=object_def,
+    ):
+        if "results" not in resp:
+            module.fail_json(
+                msg="Error getting %s objects list. Error [%s]" % (object_def, resp)
+            )
+        yield filter_nsx_objects(module, resp["results"])
+
+
+# Write pages of objects to dest file one json object per line (gzip compressed
+# when dest ends with .gz) as pages are read, return objects count
+def write_nsx_objects(module, pages):
+    import gzip
+    import tempfile
+
+    dest = module.params["dest"]
+    if module.check_mode:
+        return sum(len(nsx_objects) for nsx_objects in pages)
+
+    count = 0
+    tmp_fd, tmp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(dest)), prefix=".nsxt_policy_facts"
+    )
+    try:
+        with os.fdopen(tmp_fd, "wb") as tmp_file:
+            dest_file = tmp_file
+            if dest.endswith(".gz"):
+                dest_file = gzip.GzipFile(fileobj=tmp_file, mode="wb")
+            for nsx_objects in pages:
+                for nsx_object in nsx_objects:
+                    dest_file.write((json.dumps(nsx_object) + "\n").encode("utf-8"))
+                count += len(nsx_objects)
+            if dest_file is not tmp_file:
+                dest_file.close()
+    except Exception as err:
+        os.remove(tmp_path)
+        module.fail_json(msg="Error writing %s. Error [%s]" % (dest, to_native(err)))
+    module.atomic_move(tmp_path, dest)
+    return count
+
+
+# Return objects and their paths keyed by index key (id or display_name), objects
+# with an already used display name are kept under their id
+def get_nsx_indexed_objects(module, nsx_objects, index_key):
+    indexed_objects = {}
+    paths = {}
+    for nsx_object in nsx_objects:
+        key = nsx_object.get(index_key)
+        if key in indexed_objects:
+            module.warn(
+                "%s %s is not unique, object is indexed by its id %s"
+                % (index_key, key, nsx_object.get("id"))
+            )
+            key = nsx_object.get("id")
+        indexed_objects[key] = nsx_object
+        paths[key] = nsx_object.get("path")
+    return indexed_objects, paths
+
+
+# Yield pages of objects modified since watermark, without objects marked for
+# delete. When pages are read, output gets the new watermark (last modification
+# time of objects read) and ids of deleted objects: marked for delete, or known ids
+# missing from the objects ids listing
+def get_nsx_changed_pages(module, manager_url, api_endpoint, object_def, pages, output):
+    watermark = module.params["since"]
+    deleted_ids = []
+    for nsx_objects in pages:
+        changed_objects = []
+        for nsx_object in nsx_objects:
+            watermark = max(watermark, nsx_object.get("_last_modified_time", 0))
+            if nsx_object.get("marked_for_delete"):
+                deleted_ids.append(nsx_object["id"])
+            else:
+                changed_objects.append(nsx_object)
+        yield changed_objects
+
+    if module.params.get("known_ids"):
+        ids = set()
+        for resp in get_nsx_objects_pages(
+            module=module,
+            url=manager_url + "/" + api_endpoint + "?included_fields=id",
+            mgr_username=module.params["username"],
+            mgr_password=module.params["password"],
+            validate_certs=module.params["validate_certs"],
+            object_def=object_def,
+        ):
+            ids.update(nsx_object["id"] for nsx_object in resp.get("results") or [])
+        deleted_ids.extend(
+            object_id
+            for object_id in module.params["known_ids"]
+            if object_id not in ids and object_id not in deleted_ids
+        )
+    output["watermark"] = watermark
+    output["deleted_ids"] = deleted_ids
+
+
+# Yield pages of objects of facts module, only changed objects with since
+def get_nsx_facts_module_pages(module, manager_url, api_endpoint, object_def, output):
+    pages = get_nsx_facts_pages(module, manager_url, api_endpoint, object_def)
+    if module.params.get("since") is None:
+        return pages
+    return get_nsx_changed_pages(
+        module, manager_url, api_endpoint, object_def, pages, output
+    )
+
+
+# Exit facts module with output, in ansible_facts when cacheable
+def exit_nsx_facts(module, output, fact_name):
+    if module.params.get("cacheable"):
+        output["timestamp"] = time.time()
+        module.exit_json(
+            changed=False,
+            ansible_facts={module.params.get("fact_name") or fact_name: output},
+        )
+    module.exit_json(changed=False, **output)
+
+
 def nsx_module_facts_execution(module, manager_url, api_endpoint, object_def):
+    set_nsx_module_log(module)
     mgr_hostname = module.params["hostname"]
     mgr_username = module.params["username"]
     mgr_password = module.params["password"]
@@ -535,16 +2713,203 @@ def nsx_module_facts_execution(module, manager_url, api_endpoint, object_def):
         )
         output[object_def.replace("-", "_")] = api_json
 
+    elif module.params.get("dest"):
+        if module.params.get("output_format") == "indexed":
+            module.fail_json(msg="output_format indexed can't be used with dest")
+        output["dest"] = module.params["dest"]
+        output["count"] = write_nsx_objects(
+            module,
+            get_nsx_facts_module_pages(
+                module, manager_url, api_endpoint, object_def, output
+            ),
+        )
+
     else:
-        api_json = get_nsx_objects(
-            module=module,
-            manager_url=manager_url,
-            api_endpoint=api_endpoint,
-            mgr_username=mgr_username,
-            mgr_password=mgr_password,
-            validate_certs=validate_certs,
-            object_def=object_def,
+        nsx_objects = []
+        for page_objects in get_nsx_facts_module_pages(
+            module, manager_url, api_endpoint, object_def, output
+        ):
+            nsx_objects.extend(page_objects)
+        if module.params.get("output_format") == "indexed":
+            nsx_objects, output["paths"] = get_nsx_indexed_objects(
+                module, nsx_objects, module.params["index_key"]
+            )
+        output[api_endpoint.replace("-", "_")] = nsx_objects
+
+    exit_nsx_facts(module, output, "nsxt_" + api_endpoint.replace("-", "_"))
+
+
+# Yield objects of hierarchical api (H-API) tree without their children, parents
+# before children
+def get_nsx_hapi_objects(hapi_node):
+    for hapi_child in hapi_node.get("children") or []:
+        nsx_object = hapi_child.get(hapi_child.get("resource_type", "")[len("Child") :])
+        if nsx_object is None:
+            # ChildResourceReference only holds children of an object
+            for child_object in get_nsx_hapi_objects(hapi_child):
+                yield child_object
+            continue
+        yield dict(
+            (key, value) for key, value in nsx_object.items() if key != "children"
         )
-        output[api_endpoint.replace("-", "_")] = api_json["results"]
+        for child_object in get_nsx_hapi_objects(nsx_object):
+            yield child_object
 
-    module.exit_json(changed=False, **output)
+
+# Read infra objects tree with one hierarchical api call and return it flattened
+def nsx_infra_facts_execution(module):
+    set_nsx_module_log(module)
+    url = "https://%s/policy/api/v1/infra" % (module.params["hostname"])
+    url_params = []
+    if module.params.get("type_filter"):
+        url_params.append(
+            "type_filter=%s" % quote(";".join(module.params["type_filter"]))
+        )
+    # Children are only returned with a filter, user filter is appended to its
+    # type prefix
+    hapi_filter = module.params.get("filter") or ".*"
+    if not hapi_filter.startswith(HAPI_TYPE_FILTER):
+        hapi_filter = HAPI_TYPE_FILTER + hapi_filter
+    url_params.append("filter=%s" % quote(hapi_filter))
+    if module.params.get("base_path"):
+        url_params.append("base_path=%s" % quote(module.params["base_path"]))
+    url += "?" + "&".join(url_params)
+
+    headers = dict(Accept="application/json")
+    headers["Content-Type"] = "application/json"
+    nsx_log("info", "GET %s", url)
+    try:
+        (rc, resp) = request(
+            url=url,
+            url_username=module.params["username"],
+            url_password=module.params["password"],
+            validate_certs=module.params["validate_certs"],
+            headers=headers,
+        )
+    except Exception as err:
+        module.fail_json(
+            msg="Error getting infra objects. Error [%s]" % (to_native(err))
+        )
+
+    nsx_objects = filter_nsx_objects(module, get_nsx_hapi_objects(resp))
+    counts = {}
+    for nsx_object in nsx_objects:
+        resource_type = nsx_object.get("resource_type")
+        counts[resource_type] = counts.get(resource_type, 0) + 1
+
+    output = dict(counts=counts)
+    if module.params.get("dest"):
+        output["dest"] = module.params["dest"]
+        output["count"] = write_nsx_objects(module, [nsx_objects])
+    elif module.params.get("output_format") == "indexed":
+        output["objects"] = dict(
+            (nsx_object.get("path"), nsx_object) for nsx_object in nsx_objects
+        )
+    else:
+        output["objects"] = nsx_objects
+    exit_nsx_facts(module, output, "nsxt_infra")
+
+
+# Read objects of api endpoint (and their children of child api endpoint) of all
+# parents listed by parent urls with parallel api calls, return them by parent path
+def get_nsx_parents_objects(module, parent_urls, api_endpoint, child_api_endpoint=None):
+    base_url = "https://%s/policy/api/v1" % (module.params["hostname"])
+
+    def get_lists(urls, object_def):
+        nsx_objects, errors = get_nsx_objects_lists(
+            mgr_username=module.params["username"],
+            mgr_password=module.params["password"],
+            validate_certs=module.params["validate_certs"],
+            urls=urls,
+            parallel=module.params["parallel_requests"],
+        )
+        if errors:
+            module.fail_json(
+                msg="Error getting %s objects list. Error [%s]"
+                % (
+                    object_def,
+                    "; ".join("%s: %s" % error for error in errors.items()),
+                )
+            )
+        return nsx_objects
+
+    parent_objects = get_lists(parent_urls, "parent")
+    output_key = api_endpoint.replace("-", "_")
+    parents = {}
+    for url in parent_urls:
+        for parent in parent_objects[url]:
+            parents[parent["path"]] = {
+                "id": parent["id"],
+                "display_name": parent.get("display_name"),
+                "resource_type": parent["resource_type"],
+                output_key: [],
+            }
+
+    urls = [base_url + path + "/" + api_endpoint for path in parents]
+    nsx_objects = get_lists(urls, api_endpoint)
+    for path, url in zip(parents, urls):
+        parents[path][output_key] = filter_nsx_objects(module, nsx_objects[url])
+
+    if child_api_endpoint:
+        child_key = child_api_endpoint.replace("-", "_")
+        urls = dict(
+            (base_url + nsx_object["path"] + "/" + child_api_endpoint, path)
+            for path, parent in parents.items()
+            for nsx_object in parent[output_key]
+        )
+        child_objects = get_lists(list(urls), child_api_endpoint)
+        for parent in parents.values():
+            parent[child_key] = []
+        for url, path in urls.items():
+            parents[path][child_key].extend(child_objects[url])
+    return parents
+
+
+# Fail if module params can't be used with all objects option (objects of all
+# parents are returned in one dict by parent, not written, indexed or read since)
+def check_nsx_all_facts_params(module, option, params):
+    for param in params + ["dest", "since", "known_ids"]:
+        if module.params.get(param):
+            module.fail_json(msg="%s can't be used with %s" % (param, option))
+    for param, default in [("output_format", "list"), ("index_key", "id")]:
+        if module.params.get(param, default) != default:
+            module.fail_json(
+                msg="%s %s can't be used with %s"
+                % (param, module.params[param], option)
+            )
+
+
+# Read objects of api endpoint (and their children of child api endpoint) of all
+# tier-0s and tier-1s with parallel api calls, return them by router path
+def nsx_routers_facts_execution(module, api_endpoint, child_api_endpoint=None):
+    set_nsx_module_log(module)
+    check_nsx_all_facts_params(
+        module, "all_routers", ["tier0", "tier1", "display_name", "query"]
+    )
+    base_url = "https://%s/policy/api/v1" % (module.params["hostname"])
+    routers = get_nsx_parents_objects(
+        module,
+        [base_url + "/infra/tier-0s", base_url + "/infra/tier-1s"],
+        api_endpoint,
+        child_api_endpoint,
+    )
+    exit_nsx_facts(
+        module, dict(routers=routers), "nsxt_routers_" + api_endpoint.replace("-", "_")
+    )
+
+
+# Read edge nodes of all edge clusters of enforcement point url with parallel api
+# calls, return them by edge cluster id
+def nsx_edge_clusters_facts_execution(module, manager_url):
+    set_nsx_module_log(module)
+    check_nsx_all_facts_params(
+        module, "all_clusters", ["cluster_id", "display_name", "query"]
+    )
+    edge_clusters = get_nsx_parents_objects(
+        module, [manager_url + "/edge-clusters"], "edge-nodes"
+    )
+    clusters = dict(
+        (edge_cluster["id"], dict(edge_cluster, path=path))
+        for path, edge_cluster in edge_clusters.items()
+    )
+    exit_nsx_facts(module, dict(clusters=clusters), "nsxt_edge_clusters_edge_nodes")